@@ -135,6 +135,10 @@ function fetchMeetingData(meetingUrl) {
 
   const meetingId = m[1];
 
+  // Prefer the table the nightly scraper prepares; only hit the site for meetings it hasn't seen
+  const prepared = getPreparedMeeting(meetingId, meetingUrl);
+  if (prepared) return prepared;
+
   const opts = {
     method: 'post',
     contentType: 'application/x-www-form-urlencoded; charset=UTF-8',
@@ -176,6 +180,45 @@ return {
 };
 }
 
+/* ===========================
+   PREPARED MEETINGS
+   Meeting -> bills table written by the Python scraper (scraper.py --meetings)
+=========================== */
+
+const MEETINGS_SHEET = 'Meetings';
+const WATCHLIST_SHEET = 'Watchlist';
+
+// Agendas change up to the meeting; older prepared rows are re-fetched live instead
+const PREPARED_MAX_AGE_MS = 24 * 60 * 60 * 1000;
+
+function getPreparedMeeting(meetingId, meetingUrl) {
+  const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheetByName(MEETINGS_SHEET);
+  if (!sheet || sheet.getLastRow() < 2) return null;
+
+  // One read of the whole prepared range
+  const data = sheet.getDataRange().getValues();
+  const headers = data[0];
+  const col = name => headers.indexOf(name);
+  const rows = data.slice(1).filter(r => String(r[col('Meeting ID')]) === String(meetingId));
+  if (!rows.length) return null;
+
+  const first = rows[0];
+  const refreshed = col('Refreshed') === -1 ? NaN : new Date(first[col('Refreshed')]).getTime();
+  if (isNaN(refreshed) || Date.now() - refreshed > PREPARED_MAX_AGE_MS) return null;
+
+  return {
+    committeeName: first[col('Committee')],
+    meetingDateTime: first[col('Date/Time')],
+    meetingUrl,
+    bills: rows.map(r => ({
+      legislationId: r[col('Legislation ID')],
+      displayCode: String(r[col('Bill')]),
+      sponsor: r[col('Sponsor')],
+      billUrl: r[col('Bill URL')]
+    }))
+  };
+}
+
 /* ===========================
    MEETING EXPORT
     Create or append to Google Doc with meeting bills
@@ -216,13 +259,6 @@ function appendToDocWithMeeting(docId, meetingUrl) {
     const doc = DocumentApp.openById(docId);
     writeMeetingSections(doc.getBody(), meeting, bills, true);
 
-    // FINAL fallback: scrape HTML if APIs failed
-    if (!meetingDateTime) {
-      try {
-        meetingDateTime = scrapeMeetingDateTimeFromHtml(meetingUrl);
-      } catch (_) {}
-    } 
-
     return {
       success: true,
       docUrl: doc.getUrl(),
@@ -239,8 +275,23 @@ function appendToDocWithMeeting(docId, meetingUrl) {
    Matching bills to tracker data in sheet by Legislation ID
 =========================== */
 
+// The tracker tab: the active one when it has a Legislation ID column, else the first tab that does.
+// The scraper's Meetings and Watchlist tabs have one too, but aren't the tracker.
+function findTrackerSheet() {
+  const isTracker = sheet => {
+    if ([MEETINGS_SHEET, WATCHLIST_SHEET].includes(sheet.getName()) || !sheet.getLastColumn()) return false;
+    return sheet.getRange(1, 1, 1, sheet.getLastColumn()).getValues()[0].includes('Legislation ID');
+  };
+  const active = SpreadsheetApp.getActiveSheet();
+  if (isTracker(active)) return active;
+
+  const sheet = SpreadsheetApp.getActiveSpreadsheet().getSheets().find(isTracker);
+  if (!sheet) throw new Error('No tracker tab with a Legislation ID column for meeting export.');
+  return sheet;
+}
+
 function getBillDetailsForMeeting(meetingBills) {
-  const sheet = SpreadsheetApp.getActiveSheet();
+  const sheet = findTrackerSheet();
   const data = sheet.getDataRange().getValues();
   const headers = data[0];
 
@@ -252,16 +303,21 @@ function getBillDetailsForMeeting(meetingBills) {
     throw new Error('Missing required columns for meeting export.');
   }
 
+  // Index tracker rows by Legislation ID once, instead of scanning the sheet per bill
+  const rowsById = new Map();
+  for (let i = 1; i < data.length; i++) {
+    rowsById.set(String(data[i][idCol]), data[i]);
+  }
+
   return meetingBills.map(b => {
-    for (let i = 1; i < data.length; i++) {
-      if (data[i][idCol] == b.legislationId) {
-        return {
-          ...b,
-          briefing: data[i][briefingCol] || '',
-          goodBad: data[i][goodBadCol] || '',
-          tracked: true
-        };
-      }
+    const row = rowsById.get(String(b.legislationId));
+    if (row) {
+      return {
+        ...b,
+        briefing: row[briefingCol] || '',
+        goodBad: row[goodBadCol] || '',
+        tracked: true
+      };
     }
     return { ...b, briefing: '', goodBad: '', tracked: false };
   });
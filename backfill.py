@@ -0,0 +1,114 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from sheet_writer import SheetWriter, chunked, WRITE_CHUNK_SIZE
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+
+def parse_ga_ids(spec):
+    """Parse "150-153", "148,150,153" or a mix of both into a sorted list of GA ids"""
+    ga_ids = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(value) for value in part.split("-", 1))
+            ga_ids.update(range(min(first, last), max(first, last) + 1))
+        else:
+            ga_ids.add(int(part))
+    return sorted(ga_ids)
+
+
+def progress_key(ga_id):
+    return f"backfill:{ga_id}"
+
+
+def backfill_ga(scraper, ga_id, to_sheets=True, page_workers=None):
+    """Stream one GA through snapshot, transform and (optionally) write, returning its progress record"""
+    started = time.monotonic()
+    failed_pages = []
+    bills = scraper.iter_bills(ga_id, max_workers=page_workers, failed_pages=failed_pages)
+
+    if to_sheets:
+        writer = SheetWriter(scraper.worksheet_for_ga(ga_id), scraper.store, sheet_key=f"ga-{ga_id}",
+                             detail_columns=scraper.enricher.fetch)
+        sheet_state = writer.load_sheet_state()
+        count, written, _ = scraper.sync_bills(bills, writer, sheet_state, ga_id)
+    else:
+        count = 0
+        written = True
+        for chunk in chunked(bills, WRITE_CHUNK_SIZE):
+            scraper.store.save_records(chunk, ga_id)
+            count += len(chunk)
+
+    seconds = time.monotonic() - started
+    return {
+        "status": "done" if written and not failed_pages else "incomplete",
+        "bills": count,
+        "failed_pages": failed_pages,
+        "seconds": round(seconds, 2),
+        "bills_per_second": round(count / seconds, 1) if seconds else None,
+        "finished_at": datetime.now().isoformat()
+    }
+
+
+def backfill(scraper, ga_ids, max_parallel=2, to_sheets=True, force=False):
+    """Backfill several GAs in parallel, each into its own "GA <id>" worksheet.
+
+    Progress is recorded per GA in the snapshot store, so an interrupted
+    backfill resumes with the GAs that didn't finish. Pass force=True to
+    redo GAs that already completed.
+    """
+    results = {}
+    pending = []
+    for ga_id in ga_ids:
+        progress = scraper.store.get_meta(progress_key(ga_id))
+        if progress and progress.get("status") == "done" and not force:
+            log.info("[GA %s] Already backfilled on %s, skipping", ga_id, progress.get('finished_at'))
+            results[ga_id] = progress
+        else:
+            pending.append(ga_id)
+
+    # Every GA's page fetches share the client's connection pool, so the GAs
+    # split it between them instead of each opening max_workers connections
+    pool_size = scraper.client.pool_size
+    if max_parallel > pool_size:
+        log.warning("Only %d connections are pooled; backfilling %d GAs at a time, not %d",
+                    pool_size, pool_size, max_parallel)
+        max_parallel = pool_size
+    page_workers = max(1, min(scraper.max_workers, pool_size // max_parallel))
+
+    log.info("Backfilling %d GAs (%d at a time, %d page fetches each): %s",
+             len(pending), max_parallel, page_workers, pending)
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = {pool.submit(backfill_ga, scraper, ga_id, to_sheets, page_workers): ga_id for ga_id in pending}
+        for future in as_completed(futures):
+            ga_id = futures[future]
+            try:
+                progress = future.result()
+            except Exception as e:
+                log.exception("[GA %s] Backfill failed", ga_id)
+                progress = {"status": "failed", "error": str(e), "finished_at": datetime.now().isoformat()}
+            scraper.store.set_meta(progress_key(ga_id), progress)
+            results[ga_id] = progress
+
+    metrics.set_info(backfill=results)
+    print_report(results)
+    return results
+
+
+def print_report(results):
+    """Per-GA throughput table"""
+    log.info("Backfill report:")
+    log.info(f"{'GA':>5}  {'Status':<10}  {'Bills':>6}  {'Seconds':>8}  {'Bills/s':>8}")
+    for ga_id in sorted(results):
+        progress = results[ga_id]
+        log.info(
+            f"{ga_id:>5}  {progress.get('status', ''):<10}  {progress.get('bills', ''):>6}  "
+            f"{progress.get('seconds', ''):>8}  {progress.get('bills_per_second') or '':>8}"
+        )
@@ -0,0 +1,88 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# One code such as "HB 13", "HCR 5" or "SA 2": chamber letter, type letters, number
+CODE_PATTERN = re.compile(r"([HS])([A-Z]*)\s*(\d+)")
+
+# Compound codes chain codes together: "SA 2 to HS 1 for HB 100"
+LINK_PATTERN = re.compile(r"\s+(?:for|to)\s+", re.IGNORECASE)
+
+# Sorts after every real chamber, so unparseable codes end up last
+UNPARSED = "~"
+
+# Digits the sheet's Sort By label pads numbers to, so text order matches numeric order
+LABEL_DIGITS = 4
+
+# LegislationTypeId -> type name
+LEGISLATION_TYPES = {
+    1: "Bill",
+    2: "Resolution",
+    3: "Concurrent Resolution",
+    4: "Joint Resolution",
+    5: "Amendment",
+    6: "Substitute"
+}
+
+
+class BillCode(namedtuple("BillCode", ["chamber", "type", "number", "suffixes"])):
+    """A parsed bill code, usable directly as a sort key.
+
+    chamber, type and number describe the base bill ("H", "B", 100 for
+    "HB 100"). suffixes holds the substitutes and amendments layered on top
+    of it, innermost first, as (prefix, number) pairs, so "SA 2 to HS 1 for
+    HB 100" has suffixes (("HS", 1), ("SA", 2)) and sorts right after HB 100
+    and HS 1 for HB 100.
+    """
+
+    __slots__ = ()
+
+    @property
+    def prefix(self):
+        return self.chamber + self.type
+
+    @property
+    def base(self):
+        """The code of the underlying bill, without substitutes or amendments"""
+        return BillCode(self.chamber, self.type, self.number, ())
+
+
+@lru_cache(maxsize=16384)
+def parse_bill_code(code):
+    """BillCode for a display code like "HB 13" or "HA 1 to HS 1 for HB 100", or None"""
+    if not code:
+        return None
+    parts = LINK_PATTERN.split(code.strip().upper())
+    parsed = []
+    for part in parts:
+        match = CODE_PATTERN.fullmatch(part)
+        if not match:
+            return None
+        parsed.append(match.groups())
+
+    chamber, bill_type, number = parsed[-1]
+    suffixes = tuple((c + t, int(n)) for c, t, n in reversed(parsed[:-1]))
+    return BillCode(chamber, bill_type, int(number), suffixes)
+
+
+def bill_sort_key(code):
+    """Natural sort key for a display code; unparseable codes sort last, by their text"""
+    parsed = parse_bill_code(code)
+    if parsed is None:
+        return BillCode(UNPARSED, (code or "").strip(), 0, ())
+    return parsed
+
+
+def sort_label(code):
+    """Text form of the sort key for the sheet's Sort By column.
+
+    "HB 13" becomes "HB 0013" and "HA 1 to HS 1 for HB 100" becomes
+    "HB 0100 / HS 0001 / HA 0001", so sorting the column as text groups
+    every substitute and amendment under its bill in numeric order.
+    Unparseable codes are returned unchanged.
+    """
+    parsed = parse_bill_code(code)
+    if parsed is None:
+        return code or ""
+    parts = [(parsed.prefix, parsed.number)] + list(parsed.suffixes)
+    return " / ".join(f"{prefix} {number:0{LABEL_DIGITS}d}" for prefix, number in parts)
@@ -0,0 +1,239 @@
+import logging
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+
+from legis_client import BASE_URL
+from json_dates import json_date_millis
+from columns import INTERNAL_KEYS, DETAIL_KEYS
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+BILL_DETAIL_URL = f"{BASE_URL}/BillDetail"
+
+# Labels on the BillDetail page for each detail key, matched case-insensitively
+# against the start of the label with any "(s)" and trailing colon removed
+DETAIL_LABELS = {
+    "AdditionalSponsors": ("additional sponsor",),
+    "Cosponsors": ("co-sponsor", "cosponsor"),
+    "NextSteps": ("next step",),
+    "FiscalNote": ("fiscal note",),
+}
+
+# Detail keys whose value is the linked document rather than the link text
+LINK_KEYS = {"FiscalNote"}
+
+# Tags that separate items within one info-value block (e.g. one sponsor per link)
+ITEM_TAGS = {"a", "br", "li", "p", "tr"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+# A cached page: the bill status it was fetched for, its validators and parsed details
+DetailEntry = namedtuple("DetailEntry", ["status_ms", "etag", "last_modified", "details"])
+
+
+def _clean(text):
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _label_key(label):
+    return _clean(label.lower().replace("(s)", "")).rstrip(":").strip()
+
+
+class InfoValueParser(HTMLParser):
+    """Collect <label>Label:</label> <div class="info-value">...</div> pairs from a page.
+
+    Code.gs reads meeting notices from the same markup. A label only pairs
+    with an info-value that is the next div, so a label without a value never
+    takes a later one. Nested divs inside a value are kept; each link, line
+    break or list item becomes its own comma-separated item. Link targets in
+    a value are kept in links, resolved against the page URL.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.pairs = {}
+        self.links = {}  # {label: [absolute hrefs in its value]}
+        self._label = None  # Most recent label, waiting for its value
+        self._label_parts = None  # Text of the label being read
+        self._depth = 0  # Open divs inside the current info-value, 0 when outside one
+        self._parts = []
+        self._hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._depth:
+            if tag == "div":
+                self._depth += 1
+            if tag in ITEM_TAGS or tag == "div":
+                self._parts.append("\n")
+            href = dict(attrs).get("href") if tag == "a" else None
+            if href:
+                self._hrefs.append(urljoin(BILL_DETAIL_URL, href.strip()))
+        elif tag == "label":
+            # A label left without a value must not claim the next one
+            self._label = None
+            self._label_parts = []
+        elif tag == "div" and self._label is not None:
+            classes = (dict(attrs).get("class") or "").split()
+            if "info-value" in classes:
+                self._depth = 1
+                self._parts = []
+                self._hrefs = []
+            else:
+                # The value block follows its label directly; any other div means the label has none
+                self._label = None
+
+    def handle_endtag(self, tag):
+        if self._label_parts is not None and tag == "label":
+            self._label = _clean("".join(self._label_parts))
+            self._label_parts = None
+        elif self._depth and tag == "div":
+            self._depth -= 1
+            if not self._depth:
+                items = (_clean(item).strip(",;").strip() for item in "".join(self._parts).split("\n"))
+                self.pairs[self._label] = ", ".join(item for item in items if item)
+                self.links[self._label] = self._hrefs
+                self._label = None
+        elif self._depth and tag in ITEM_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data):
+        if self._label_parts is not None:
+            self._label_parts.append(data)
+        elif self._depth:
+            self._parts.append(data)
+
+
+def parse_bill_detail(html_text):
+    """{detail key: text} from a BillDetail page; keys the page doesn't show are "".
+
+    LINK_KEYS get the URL of their linked document instead of its link text,
+    when the value has one.
+    """
+    parser = InfoValueParser()
+    parser.feed(html_text)
+    parser.close()
+
+    details = {key: "" for key in DETAIL_KEYS}
+    for raw_label, value in parser.pairs.items():
+        label = _label_key(raw_label)
+        for key, prefixes in DETAIL_LABELS.items():
+            if not details[key] and label.startswith(prefixes):
+                links = parser.links.get(raw_label) if key in LINK_KEYS else None
+                details[key] = ", ".join(links) if links else value
+    return details
+
+
+def keep_sheet_details(bills, existing_bills):
+    """Give bills without fetched details whatever their row in one sheet already shows"""
+    for bill in bills:
+        row = existing_bills.get(str(bill.LegislationId).strip())
+        if row:
+            bill.update(**{key: row.values[INTERNAL_KEYS.index(key)] for key in DETAIL_KEYS})
+
+
+class DetailEnricher:
+    """Fills the BillDetail fields of transformed bills, fetching only what the cache can't answer.
+
+    Pages are cached in the snapshot store per LegislationId together with the
+    LegislationStatusDateTime they were fetched for, so a bill is only
+    re-fetched after its status changes. Re-fetches are conditional on the
+    previous ETag/Last-Modified, and a 304 reuses the parsed details.
+
+    With fetch=False nothing is downloaded and bills get their cached details.
+    Bills with no cached page are returned by enrich(); the sheet writer gives
+    them what that sheet's row already shows (keep_sheet_details).
+    """
+
+    def __init__(self, client, store, max_workers=4, fetch=True):
+        self.client = client
+        self.store = store
+        self.max_workers = max_workers
+        self.fetch = fetch
+        self.fetched = 0
+        self.revalidated = 0
+        self.cache_hits = 0
+        self.failed = []
+        self.lock = threading.Lock()  # Counters are bumped from pool threads
+
+    def enrich(self, raw_bills, bills, fetch=None):
+        """Set the detail fields on bills (transformed from raw_bills, in the same order).
+
+        fetch overrides the enricher's own setting for this call. Returns the
+        bills left without details because their page was never fetched.
+        """
+        fetch = self.fetch if fetch is None else fetch
+        wanted = {
+            raw["LegislationId"]: json_date_millis(raw.get("LegislationStatusDateTime")) or 0
+            for raw in raw_bills
+        }
+        cached = {leg_id: DetailEntry._make(entry)
+                  for leg_id, entry in self.store.load_bill_details(wanted).items()}
+
+        stale = [leg_id for leg_id, status_ms in wanted.items()
+                 if leg_id not in cached or cached[leg_id].status_ms != status_ms]
+        self.cache_hits += len(wanted) - len(stale)
+        metrics.count("detail_cache_hits", len(wanted) - len(stale))
+
+        if fetch and stale:
+            log.info("Fetching %d bill detail pages (%d cached)", len(stale), len(wanted) - len(stale))
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                entries = list(pool.map(
+                    lambda leg_id: self._fetch(leg_id, wanted[leg_id], cached.get(leg_id)), stale
+                ))
+            fresh = {leg_id: entry for leg_id, entry in zip(stale, entries) if entry}
+            self.store.save_bill_details((leg_id,) + tuple(entry) for leg_id, entry in fresh.items())
+            cached.update(fresh)
+
+        undetailed = []
+        for bill in bills:
+            entry = cached.get(bill.LegislationId)
+            if entry:
+                bill.update(**entry.details)
+            else:
+                undetailed.append(bill)
+        return undetailed
+
+    def _fetch(self, legislation_id, status_ms, previous):
+        """Fetch and parse one page, revalidating a previous copy; None on failure"""
+        headers = {}
+        if previous and previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous and previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+
+        try:
+            response = self.client.get(
+                BILL_DETAIL_URL, params={"LegislationId": legislation_id}, headers=headers
+            )
+        except requests.RequestException as e:
+            log.warning("Detail page for %s failed: %s", legislation_id, e)
+            metrics.count("detail_failed")
+            with self.lock:
+                self.failed.append(legislation_id)
+            return None
+
+        if response.status_code == 304 and previous:
+            details = previous.details
+            metrics.count("detail_not_modified")
+            with self.lock:
+                self.revalidated += 1
+        else:
+            with metrics.timer("parse_detail"):
+                details = parse_bill_detail(response.text)
+            metrics.count("detail_fetched")
+            with self.lock:
+                self.fetched += 1
+        return DetailEntry(
+            status_ms, response.headers.get("ETag"), response.headers.get("Last-Modified"), details
+        )
+
+    def summary(self):
+        return (f"Bill details: {self.cache_hits} cached, {self.fetched} fetched, "
+                f"{self.revalidated} unchanged (304), {len(self.failed)} failed")
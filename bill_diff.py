@@ -0,0 +1,52 @@
+import hashlib
+from collections import namedtuple
+
+from columns import HEADER_MAPPING, INTERNAL_KEYS, COMPARED_KEYS
+
+# One changed cell: which bill, which field, and the before/after values as compared
+FieldChange = namedtuple("FieldChange", ["legislation_id", "key", "header", "old", "new"])
+
+# Positions of the compared columns within a row of synced values (INTERNAL_KEYS order)
+COMPARED_INDEXES = [INTERNAL_KEYS.index(key) for key in COMPARED_KEYS]
+
+_SEPARATOR = "\x1f"  # Unit separator; won't appear in sheet text
+
+
+def normalize(value):
+    """Value as it compares against the sheet (None and whitespace-only read back as "")"""
+    return "" if value is None else str(value).strip()
+
+
+def fingerprint(values):
+    """Stable hash over an ordered sequence of normalized values"""
+    joined = _SEPARATOR.join(normalize(value) for value in values)
+    return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def row_fingerprint(values):
+    """Fingerprint of a row of synced values over the compared columns"""
+    return fingerprint(values[i] for i in COMPARED_INDEXES)
+
+
+def added_change(bill, header_mapping=HEADER_MAPPING):
+    """The journal entry for a bill first written to the sheet: its status, with no old value"""
+    header = header_mapping.get("Status", HEADER_MAPPING["Status"])
+    return FieldChange(normalize(bill.LegislationId), "Status", header, None, normalize(bill.Status))
+
+
+def diff_fields(bill, sheet_row, header_mapping=HEADER_MAPPING):
+    """Field-by-field changes between a transformed Bill and its SheetRow.
+
+    Headers come from header_mapping, the names used by the sheet being diffed.
+    """
+    changes = []
+    leg_id = normalize(bill.LegislationId)
+    new_values = bill.sheet_values()
+    old_values = sheet_row.values
+    for i in COMPARED_INDEXES:
+        new_value = normalize(new_values[i])
+        old_value = normalize(old_values[i])
+        if new_value != old_value:
+            key = INTERNAL_KEYS[i]
+            changes.append(FieldChange(leg_id, key, header_mapping.get(key, HEADER_MAPPING[key]), old_value, new_value))
+    return changes
@@ -0,0 +1,84 @@
+import csv
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from columns import HEADER_MAPPING
+from json_dates import DELAWARE_TZ
+
+log = logging.getLogger(__name__)
+
+EXPORT_HEADERS = ["Observed At", "Sheet", "Legislation ID", "Bill", "Field", "Old", "New"]
+
+RELATIVE_PATTERN = re.compile(r"^(\d+)\s*([mhdw])$")
+RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_since(text, now=None):
+    """Epoch ms for a --changes-since value.
+
+    Accepts a lookback ("90m", "24h", "7d", "2w"), an ISO date or datetime
+    (Delaware time unless it carries an offset), or epoch milliseconds.
+    """
+    text = text.strip()
+    match = RELATIVE_PATTERN.match(text.lower())
+    if match:
+        now = now or datetime.now(DELAWARE_TZ)
+        since = now - timedelta(**{RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+        return int(since.timestamp() * 1000)
+    if text.isdigit():
+        return int(text)
+    try:
+        since = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Not a lookback, ISO date/time or epoch ms: {text!r}") from None
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=DELAWARE_TZ)
+    return int(since.timestamp() * 1000)
+
+
+def event_row(event):
+    """An export row for a ChangeEvent; a newly added bill has no old value"""
+    observed = datetime.fromtimestamp(event.observed_at / 1000, DELAWARE_TZ)
+    return [
+        observed.isoformat(timespec="seconds"),
+        event.sheet_key,
+        event.legislation_id,
+        event.legislation_number or "",
+        event.header or HEADER_MAPPING.get(event.field, event.field),
+        event.old,
+        event.new,
+    ]
+
+
+def export_changes(store, since_ms, path="-", until_ms=None, sheet_key=None):
+    """Write the changes journaled since since_ms as CSV, or JSON lines when path ends in .jsonl.
+
+    Only the journal's observed_at range is read; "-" writes to stdout.
+    Returns the number of changes written.
+    """
+    started = time.perf_counter()
+    events = store.changes_since(since_ms, until_ms, sheet_key)
+    out = sys.stdout if path == "-" else open(path, "w", newline="")
+    count = 0
+    try:
+        if path.endswith(".jsonl"):
+            for event in events:
+                out.write(json.dumps(dict(zip(EXPORT_HEADERS, event_row(event)))) + "\n")
+                count += 1
+        else:
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_HEADERS)
+            for event in events:
+                writer.writerow(event_row(event))
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    log.info("Exported %d changes since %s to %s in %.2fs",
+             count, datetime.fromtimestamp(since_ms / 1000, DELAWARE_TZ).isoformat(timespec="seconds"),
+             path, time.perf_counter() - started)
+    return count
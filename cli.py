@@ -0,0 +1,252 @@
+"""Command line for the Delaware legislation scraper.
+
+    python cli.py fetch [--ga 153] [--full] [--enrich]    API -> snapshot store only
+    python cli.py diff [--full]                           print what a sync would write
+    python cli.py sync [--dry-run] [--meetings] ...       API -> store -> Google Sheets
+    python cli.py export [--dir export] [--format csv]    store -> files, per GA
+    python cli.py changes --since 24h [--out moved.csv]   change journal -> CSV/JSON lines
+    python cli.py search "rent* OR evict*"                full-text search of the store
+    python cli.py backfill 148-152 [--no-sheets]          past GAs -> "GA <id>" tabs
+
+Each command imports only what it uses: gspread and Google auth are loaded by
+the commands that talk to Sheets, so local commands start without them.
+"""
+import argparse
+import logging
+import os
+import sys
+
+from metrics import setup_logging, REPORT_PATH
+
+log = logging.getLogger(__name__)
+
+SPREADSHEET_NAME = "DE WFP Bill Tracker GA 153"
+
+
+def service_account_path():
+    """Credentials file from GOOGLE_SERVICE_ACCOUNT_JSON, which may hold the JSON itself (GitHub secrets)"""
+    service_account = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', 'service-account.json')
+    if service_account.startswith('{'):
+        with open('/tmp/service-account.json', 'w') as f:
+            f.write(service_account)
+        service_account = '/tmp/service-account.json'
+    return service_account
+
+
+def full_sync_requested(args):
+    return args.full or os.getenv('FULL_SYNC', '').lower() in ('1', 'true', 'yes')
+
+
+def make_scraper(args, spreadsheet_name=SPREADSHEET_NAME, sheets=True):
+    """The scraper for a command; credentials are only resolved when it will open a spreadsheet"""
+    from scraper import DelawareLegislationScraper
+
+    http_cache = None
+    if args.http_cache:
+        from http_cache import ResponseCache
+        http_cache = ResponseCache(mode=args.http_cache)
+    return DelawareLegislationScraper(service_account_path() if sheets else None, spreadsheet_name,
+                                      enrich=getattr(args, "enrich", False), http_cache=http_cache)
+
+
+def open_store():
+    from snapshot_store import SnapshotStore
+    return SnapshotStore()
+
+
+def cmd_fetch(args):
+    scraper = make_scraper(args, sheets=False)
+    scraper.fetch(args.ga, full_sync=full_sync_requested(args))
+
+
+def cmd_diff(args):
+    scraper = make_scraper(args, sheets=False)
+    scraper.run(full_sync=full_sync_requested(args), ga_id=args.ga, dry_run=True)
+
+    writer = scraper.writer
+    for bill in writer.planned_new:
+        print("\t".join(["+", str(bill.LegislationId), bill.BillNumber or "", bill.Status or "", bill.ShortTitle or ""]))
+    for change in writer.planned_changes:
+        print("\t".join(["~", change.legislation_id, change.header, str(change.old), str(change.new)]))
+    log.info("%d new bills and %d changed fields in %d batchUpdate calls (%d bytes)",
+             len(writer.planned_new), len(writer.planned_changes), len(writer.planned_calls),
+             sum(size for _, _, size in writer.planned_calls))
+
+
+def cmd_sync(args):
+    full_sync = full_sync_requested(args)
+
+    if args.targets is not None:
+        from targets import load_targets, TARGETS_PATH
+        scraper = make_scraper(args, spreadsheet_name=None, sheets=not args.dry_run)
+        scraper.run_targets(load_targets(args.targets or TARGETS_PATH), full_sync=full_sync,
+                            reconcile=args.reconcile, ga_id=args.ga, dry_run=args.dry_run)
+        return
+
+    if args.dry_run and (args.meetings is not None or args.watchlists is not None):
+        log.info("Dry run: skipping the Meetings and Watchlist tabs")
+
+    watchlists = None
+    if args.watchlists is not None and not args.dry_run:
+        from watchlists import load_watchlists, WATCHLISTS_PATH
+        if not args.watchlists and not os.path.exists(WATCHLISTS_PATH):
+            log.info("No %s, skipping watchlists", WATCHLISTS_PATH)
+        else:
+            watchlists = load_watchlists(args.watchlists or WATCHLISTS_PATH)
+
+    meeting_ids = None
+    if args.meetings is not None and not args.dry_run:
+        from meetings import parse_meeting_ids
+        meeting_ids = parse_meeting_ids(args.meetings)
+
+    scraper = make_scraper(args, sheets=not args.dry_run)
+    scraper.run(full_sync=full_sync, reconcile=args.reconcile, ga_id=args.ga, meeting_ids=meeting_ids,
+                watchlists=watchlists, dry_run=args.dry_run)
+
+
+def cmd_backfill(args):
+    from backfill import backfill, parse_ga_ids
+    from metrics import metrics
+
+    metrics.set_info(mode="backfill")
+    scraper = make_scraper(args, sheets=not args.no_sheets)
+    backfill(scraper, parse_ga_ids(args.ga_ids), max_parallel=args.parallel,
+             to_sheets=not args.no_sheets, force=args.force)
+
+
+def cmd_export(args):
+    from export import export_legislation, EXPORT_DIR, pa
+
+    if args.format in ("parquet", "arrow") and pa is None:
+        # Asked for by name, so don't quietly write CSV instead
+        sys.exit(f"--format {args.format} needs pyarrow: pip install pyarrow, or use --format csv")
+
+    store = open_store()
+    try:
+        export_legislation(store, args.dir or EXPORT_DIR, args.format)
+    finally:
+        store.close()
+
+
+def cmd_changes(args):
+    from change_journal import export_changes, parse_since
+
+    store = open_store()
+    try:
+        export_changes(store, parse_since(args.since), args.out)
+    finally:
+        store.close()
+
+
+def cmd_search(args):
+    from watchlists import write_matches
+
+    store = open_store()
+    try:
+        log.info("%d matches", write_matches(store, args.query, args.ga))
+    finally:
+        store.close()
+
+
+def build_parser():
+    # Defaults that live in other modules are resolved by the command, so parsing imports nothing
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--log-level", default=os.getenv('LOG_LEVEL', 'INFO'),
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], type=str.upper,
+                        help="logging verbosity (default INFO, or LOG_LEVEL)")
+
+    # Commands that fetch from legis.delaware.gov and write a run report
+    run = argparse.ArgumentParser(add_help=False, parents=[common])
+    run.add_argument("--http-cache", choices=["cache", "record", "replay"],
+                     help="cache legis.delaware.gov responses on disk; 'record' a run and 'replay' it offline")
+    run.add_argument("--report", default=REPORT_PATH, metavar="PATH",
+                     help=f"where to write the JSON run report (default {REPORT_PATH})")
+
+    incremental = argparse.ArgumentParser(add_help=False, parents=[run])
+    incremental.add_argument("--ga", type=int, default=153, help="General Assembly (default 153)")
+    incremental.add_argument("--full", action="store_true",
+                             help="ignore the saved watermark and re-fetch every bill (or FULL_SYNC=1)")
+    incremental.add_argument("--enrich", action="store_true",
+                             help="fetch BillDetail pages for cosponsors, next steps and fiscal notes")
+
+    parser = argparse.ArgumentParser(description="Sync Delaware legislation to Google Sheets")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    fetch = commands.add_parser("fetch", parents=[incremental],
+                                help="fetch bills into the snapshot store without touching Sheets")
+    fetch.set_defaults(handler=cmd_fetch, runs=True)
+
+    diff = commands.add_parser("diff", parents=[incremental],
+                               help="fetch and print the bills and fields a sync would write, against the local index")
+    diff.set_defaults(handler=cmd_diff, runs=True)
+
+    sync = commands.add_parser("sync", parents=[incremental], help="fetch bills and write them to Google Sheets")
+    sync.add_argument("--dry-run", action="store_true",
+                      help="log the planned Sheets calls instead of making them; the watermark stays put")
+    sync.add_argument("--reconcile", action="store_true",
+                      help="re-read the whole sheet instead of trusting the local row index")
+    sync.add_argument("--meetings", nargs="?", const="", metavar="IDS",
+                      help="refresh the Meetings tab: upcoming meetings already in it, plus any "
+                           "comma-separated meeting ids or Meeting Notice URLs given")
+    sync.add_argument("--watchlists", nargs="?", const="", metavar="PATH",
+                      help="write bills matching the saved queries in PATH (default watchlists.json) "
+                           "to the Watchlist tab; skipped when the default file doesn't exist")
+    sync.add_argument("--targets", nargs="?", const="", metavar="PATH",
+                      help="write to the spreadsheets configured in PATH (default targets.json) "
+                           "instead of the tracker spreadsheet, fetching once for all of them")
+    sync.set_defaults(handler=cmd_sync, runs=True)
+
+    backfill = commands.add_parser("backfill", parents=[run], help="backfill past GAs into per-GA worksheets")
+    backfill.add_argument("ga_ids", metavar="GA_IDS", help='e.g. "148-152" or "150,152"')
+    backfill.add_argument("--parallel", type=int, default=2, help="GAs to backfill at once (default 2); they share the 8 pooled connections")
+    backfill.add_argument("--no-sheets", action="store_true", help="backfill into the local snapshot store only")
+    backfill.add_argument("--force", action="store_true", help="re-run GAs the backfill already completed")
+    backfill.set_defaults(handler=cmd_backfill, runs=True)
+
+    export = commands.add_parser("export", parents=[common],
+                                 help="export every stored GA, partitioned by GA, from the snapshot store")
+    export.add_argument("--dir", help="output directory (default export, or SCRAPER_EXPORT_DIR)")
+    export.add_argument("--format", choices=["parquet", "arrow", "csv"],
+                        help="parquet (default with pyarrow), arrow (memory-mappable IPC) or csv")
+    export.set_defaults(handler=cmd_export, runs=False)
+
+    changes = commands.add_parser("changes", parents=[common], help="export the journaled changes since a time")
+    changes.add_argument("--since", required=True, metavar="SINCE",
+                         help='a lookback, date or time: "24h", "7d", "2025-06-01"')
+    changes.add_argument("--out", default="-", metavar="PATH",
+                         help="a .csv or .jsonl path, or - for stdout (default)")
+    changes.set_defaults(handler=cmd_changes, runs=False)
+
+    search = commands.add_parser("search", parents=[common], help="search stored titles and synopses")
+    search.add_argument("query", metavar="QUERY", help='FTS5 syntax, e.g. "rent* OR evict*"')
+    search.add_argument("--ga", type=int, action="append", help="limit to a GA (repeatable)")
+    search.set_defaults(handler=cmd_search, runs=False)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "sync" and args.targets is not None and (args.meetings is not None
+                                                                or args.watchlists is not None):
+        # Both write tabs of the tracker spreadsheet, which a --targets run doesn't open
+        parser.error("--meetings and --watchlists can't be combined with --targets")
+    setup_logging(args.log_level)
+    if not args.runs:
+        args.handler(args)
+        return
+
+    from metrics import metrics
+    try:
+        args.handler(args)
+    except Exception as e:
+        metrics.set_info(success=False, error=repr(e))
+        raise
+    finally:
+        # Also written for failed runs, so the artifact shows how far they got
+        metrics.write_report(args.report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,62 @@
+# Map from our internal keys to the sheet's column names
+HEADER_MAPPING = {
+    "LegislationId": "Legislation ID",
+    "DisplayCode": "Bill Number",  # This will be the hyperlink
+    "SortBy": "Sort By",
+    "ShortTitle": "Short Title",
+    "LongTitle": "Long Title",
+    "Synopsis": "Synopsis",
+    "Type": "Type",
+    "IntroducedDate": "Introduced",
+    "Sponsor": "Primary Sponsor",
+    "Chamber": "Chamber",
+    "Status": "Status",
+    "LastStatusDate": "As of",
+    "HasAmendments": "Has Amendments",
+    "ParentBill": "Parent Bill",
+    "AmendmentParent": "Amendment Parent",
+    "AdditionalSponsors": "Additional Sponsors",  # These four come from the BillDetail page
+    "Cosponsors": "Cosponsors",
+    "NextSteps": "Next Steps",
+    "FiscalNote": "Fiscal Note"
+}
+
+# Internal keys in the order they should appear
+INTERNAL_KEYS = [
+    "LegislationId", "DisplayCode", "SortBy", "ShortTitle",
+    "LongTitle", "Synopsis", "Type", "IntroducedDate",
+    "Sponsor", "Chamber", "Status", "LastStatusDate",
+    "HasAmendments", "ParentBill", "AmendmentParent",
+    "AdditionalSponsors", "Cosponsors", "NextSteps", "FiscalNote"
+]
+
+# Keys filled by scraping the BillDetail page rather than from GetAllLegislation
+DETAIL_KEYS = ["AdditionalSponsors", "Cosponsors", "NextSteps", "FiscalNote"]
+
+# Columns compared when diffing; DisplayCode is a HYPERLINK formula that reads
+# back as plain text, so it never matches what we write
+COMPARED_KEYS = [key for key in INTERNAL_KEYS if key != "DisplayCode"]
+
+# Header of the column used to match sheet rows to API records
+ID_HEADER = HEADER_MAPPING["LegislationId"]
+
+
+def col_letter(col_num):
+    """Convert column number to letter (1=A, 2=B, ..., 27=AA)"""
+    result = ""
+    while col_num > 0:
+        col_num -= 1
+        result = chr(col_num % 26 + ord('A')) + result
+        col_num //= 26
+    return result
+
+
+def column_runs(col_indexes):
+    """Group 0-based column indexes into sorted, contiguous (start, end) runs"""
+    runs = []
+    for col in sorted(col_indexes):
+        if runs and col == runs[-1][1] + 1:
+            runs[-1][1] = col
+        else:
+            runs.append([col, col])
+    return [tuple(run) for run in runs]
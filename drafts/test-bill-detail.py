@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bill_detail import BILL_DETAIL_URL, InfoValueParser, parse_bill_detail
+from legis_client import LegisClient
+
+# Parse saved BillDetail pages offline:
+#   python drafts/test-bill-detail.py page1.html page2.html ...
+# Save a page to parse later:
+#   python drafts/test-bill-detail.py --save 141107 testing/fixtures/hb-100.html
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--save":
+        legislation_id, path = sys.argv[2], sys.argv[3]
+        response = LegisClient().get(BILL_DETAIL_URL, params={"LegislationId": legislation_id})
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(response.text)
+        print(f"Saved {len(response.text):,} bytes to {path}")
+        sys.exit()
+
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            html_text = f.read()
+
+        started = time.perf_counter()
+        details = parse_bill_detail(html_text)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n{path} ({len(html_text):,} bytes, parsed in {elapsed_ms:.1f} ms)")
+        for key, value in details.items():
+            print(f"  {key}: {value!r}")
+
+        # Every label/value pair found, to spot labels DETAIL_LABELS doesn't match yet
+        parser = InfoValueParser()
+        parser.feed(html_text)
+        print("  All labels:")
+        for label, value in parser.pairs.items():
+            print(f"    {label} {value[:60]!r}")
@@ -1,4 +1,9 @@
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from legis_client import LegisClient
 
 def parse_json_date(json_date):
     """Convert JSON date format to readable format"""
@@ -44,30 +49,8 @@ if __name__ == "__main__":
     
     # Test with real bill data
     print("\n--- Testing with real API data ---")
-    import requests
-    
-    url = "https://legis.delaware.gov/json/AllLegislation/GetAllLegislation"
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
-        "Referer": "https://legis.delaware.gov/AllLegislation",
-        "Accept": "*/*"
-    }
-    data = {
-        "sort": "",
-        "page": 1,
-        "pageSize": 5,  # Just get 5 bills for testing
-        "group": "",
-        "filter": "",
-        "selectedGA[0]": 153,
-        "sponsorName": "",
-        "fromIntroDate": "",
-        "toIntroDate": "",
-        "coSponsorCheck": False
-    }
-    
-    response = requests.post(url, headers=headers, data=data)
-    result = response.json()
+    client = LegisClient()
+    result = client.fetch_legislation_page(153, page=1, page_size=5)
     
     print("\nParsing dates from first 5 bills:")
     for bill in result['Data']:
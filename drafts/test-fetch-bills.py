@@ -1,39 +1,21 @@
-import requests
-import time
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from legis_client import LegisClient
 
 def fetch_all_bills(ga_id=153, page_size=100):
     """Fetch all bills from GA 153 across multiple pages"""
     
-    url = "https://legis.delaware.gov/json/AllLegislation/GetAllLegislation"
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
-        "Referer": "https://legis.delaware.gov/AllLegislation",
-        "Accept": "*/*"
-    }
+    client = LegisClient()
     
     bills = []
     page = 1
     
     # Get first page to determine total
     print(f"Fetching page 1...")
-    data = {
-        "sort": "",
-        "page": page,
-        "pageSize": page_size,
-        "group": "",
-        "filter": "",
-        "selectedGA[0]": ga_id,
-        "sponsorName": "",
-        "fromIntroDate": "",
-        "toIntroDate": "",
-        "coSponsorCheck": False
-    }
-    
-    response = requests.post(url, headers=headers, data=data)
-    response.raise_for_status()
-    result = response.json()
+    result = client.fetch_legislation_page(ga_id, page, page_size)
     
     total = result['Total']
     bills.extend(result['Data'])
@@ -47,16 +29,11 @@ def fetch_all_bills(ga_id=153, page_size=100):
     # Fetch remaining pages
     for page in range(2, total_pages + 1):
         print(f"Fetching page {page}/{total_pages}...")
-        data["page"] = page
         
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        result = response.json()
+        result = client.fetch_legislation_page(ga_id, page, page_size)
         
         bills.extend(result['Data'])
         print(f"Got {len(result['Data'])} bills from page {page}")
-        
-        time.sleep(0.2)  # Rate limiting - be nice to their server
     
     print(f"\nTotal bills fetched: {len(bills)}")
     return bills
@@ -1,4 +1,9 @@
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from legis_client import LegisClient
 
 def parse_json_date(json_date):
     """Convert JSON date format to readable format"""
@@ -40,31 +45,9 @@ def transform_bill(bill):
 
 # Test it
 if __name__ == "__main__":
-    import requests
-    
-    url = "https://legis.delaware.gov/json/AllLegislation/GetAllLegislation"
-    headers = {
-        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
-        "Referer": "https://legis.delaware.gov/AllLegislation",
-        "Accept": "*/*"
-    }
-    data = {
-        "sort": "",
-        "page": 1,
-        "pageSize": 3,  # Get 3 bills for testing
-        "group": "",
-        "filter": "",
-        "selectedGA[0]": 153,
-        "sponsorName": "",
-        "fromIntroDate": "",
-        "toIntroDate": "",
-        "coSponsorCheck": False
-    }
-    
     print("Fetching sample bills from API...\n")
-    response = requests.post(url, headers=headers, data=data)
-    result = response.json()
+    client = LegisClient()
+    result = client.fetch_legislation_page(153, page=1, page_size=3)
     
     print(f"Got {len(result['Data'])} bills\n")
     print("=" * 80)
@@ -91,9 +74,7 @@ if __name__ == "__main__":
     
     # Test with all bills to check for any transformation errors
     print("\n\nTesting transformation on all bills from page 1...")
-    data["pageSize"] = 100
-    response = requests.post(url, headers=headers, data=data)
-    result = response.json()
+    result = client.fetch_legislation_page(153, page=1, page_size=100)
     
     success_count = 0
     error_count = 0
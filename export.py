@@ -0,0 +1,181 @@
+import csv
+import logging
+import os
+from datetime import date
+
+from bill_codes import LEGISLATION_TYPES, sort_label
+from bill_detail import BILL_DETAIL_URL
+from columns import DETAIL_KEYS
+from json_dates import json_date_millis, millis_to_date
+from metrics import metrics
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: without pyarrow the export is CSV only
+    pa = pq = None
+
+log = logging.getLogger(__name__)
+
+# Where bulk exports go: one directory per GA ("ga=153/"), readable as a hive-partitioned dataset
+EXPORT_DIR = os.getenv('SCRAPER_EXPORT_DIR', 'export')
+
+FORMATS = ("parquet", "arrow", "csv")
+FILE_NAMES = {"parquet": "legislation.parquet", "arrow": "legislation.arrow", "csv": "legislation.csv"}
+
+# Exported columns and their Arrow types; GA is the partition, so it lives in the path only
+COLUMN_TYPES = [
+    ("LegislationId", "int64"),
+    ("BillNumber", "string"),
+    ("DisplayCode", "string"),
+    ("SortBy", "string"),
+    ("Type", "dictionary"),
+    ("Chamber", "dictionary"),
+    ("Sponsor", "string"),
+    ("ShortTitle", "string"),
+    ("LongTitle", "string"),
+    ("Synopsis", "string"),
+    ("Status", "dictionary"),
+    ("IntroducedDate", "date"),
+    ("LastStatusDate", "date"),
+    ("StatusDateTime", "timestamp"),
+    ("HasAmendments", "bool"),
+    ("ParentBill", "string"),
+    ("AmendmentParent", "string"),
+] + [(key, "string") for key in DETAIL_KEYS] + [("Url", "string")]
+
+COLUMN_NAMES = [name for name, _ in COLUMN_TYPES]
+
+
+def default_format():
+    return "parquet" if pa is not None else "csv"
+
+
+def _field(records, name):
+    return [record.get(name) for record in records]
+
+
+def _dates(millis):
+    """Delaware calendar dates for a column of epoch ms (None stays None); cached per UTC day"""
+    return [None if ms is None else millis_to_date(ms) for ms in millis]
+
+
+def legislation_columns(records, details=None):
+    """Column arrays for raw GetAllLegislation records, in the order given.
+
+    Each conversion runs over a whole column at once: dates from one pass of
+    millisecond parsing, type names from one lookup table, sort labels
+    through the cached bill-code parser. details is the snapshot store's
+    {LegislationId: (status_ms, etag, last_modified, details)}.
+    """
+    details = details or {}
+    ids = _field(records, "LegislationId")
+    numbers = _field(records, "LegislationNumber")
+    parents = [parent or "" for parent in _field(records, "SubstituteParentLegislationDisplayCode")]
+    amendment_parents = [parent or "" for parent in _field(records, "AmendmentParentLegislationDisplayCode")]
+    status_ms = [json_date_millis(value) for value in _field(records, "LegislationStatusDateTime")]
+
+    columns = {
+        "LegislationId": ids,
+        "BillNumber": numbers,
+        "DisplayCode": _field(records, "LegislationDisplayCode"),
+        "SortBy": [sort_label(parent or amendment_parent or number)
+                   for parent, amendment_parent, number in zip(parents, amendment_parents, numbers)],
+        "Type": [LEGISLATION_TYPES.get(type_id, f"Unknown ({type_id})")
+                 for type_id in _field(records, "LegislationTypeId")],
+        "Chamber": _field(records, "ChamberName"),
+        "Sponsor": _field(records, "Sponsor"),
+        "ShortTitle": [title or "" for title in _field(records, "ShortTitle")],
+        "LongTitle": [title or "" for title in _field(records, "LongTitle")],
+        "Synopsis": [synopsis or "" for synopsis in _field(records, "Synopsis")],
+        "Status": _field(records, "StatusName"),
+        "IntroducedDate": _dates(json_date_millis(value) for value in _field(records, "IntroductionDateTime")),
+        "LastStatusDate": _dates(status_ms),
+        "StatusDateTime": status_ms,
+        "HasAmendments": [bool(value) for value in _field(records, "HasAmendments")],
+        "ParentBill": parents,
+        "AmendmentParent": amendment_parents,
+        "Url": [f"{BILL_DETAIL_URL}?LegislationId={leg_id}" for leg_id in ids],
+    }
+    cached = [details.get(leg_id) for leg_id in ids]
+    for key in DETAIL_KEYS:
+        columns[key] = [entry[3].get(key, "") if entry else "" for entry in cached]
+    return columns
+
+
+def _arrow_type(kind):
+    return {
+        "int64": pa.int64(),
+        "string": pa.string(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+        "bool": pa.bool_(),
+    }[kind]
+
+
+def to_arrow(columns):
+    """A pyarrow Table from legislation_columns(); repeated strings are dictionary-encoded"""
+    arrays = []
+    for name, kind in COLUMN_TYPES:
+        values = columns[name]
+        if kind == "dictionary":
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        elif kind == "date":
+            arrays.append(pa.array([None if value is None else date.fromisoformat(value) for value in values],
+                                   pa.date32()))
+        else:
+            arrays.append(pa.array(values, _arrow_type(kind)))
+    return pa.Table.from_arrays(arrays, schema=pa.schema([(name, _arrow_type(kind)) for name, kind in COLUMN_TYPES]))
+
+
+def _write_csv(columns, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMN_NAMES)
+        writer.writerows(zip(*(["" if value is None else value for value in columns[name]]
+                               for name in COLUMN_NAMES)))
+
+
+def write_partition(columns, directory, fmt):
+    """Write one GA's columns into directory, replacing any previous export atomically"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, FILE_NAMES[fmt])
+    temp_path = f"{path}.tmp"
+    if fmt == "csv":
+        _write_csv(columns, temp_path)
+    else:
+        table = to_arrow(columns)
+        if fmt == "parquet":
+            pq.write_table(table, temp_path)
+        else:
+            # Uncompressed Arrow IPC, so readers can memory-map it
+            with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(temp_path, path)
+    return path
+
+
+def export_legislation(store, directory=EXPORT_DIR, fmt=None, ga_ids=None):
+    """Export every stored bill, one partition per GA, without touching Google Sheets.
+
+    fmt is parquet, arrow or csv (default parquet when pyarrow is installed);
+    parquet and arrow fall back to CSV without pyarrow. Returns {ga_id: path}.
+    """
+    fmt = fmt or default_format()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {FORMATS}")
+    if fmt != "csv" and pa is None:
+        log.warning("pyarrow is not installed, exporting CSV instead of %s", fmt)
+        fmt = "csv"
+
+    paths = {}
+    for ga_id in ga_ids or store.ga_ids():
+        with metrics.timer("export"):
+            records = list(store.iter_records(ga_id))  # Natural bill-number order
+            details = store.load_bill_details(record["LegislationId"] for record in records)
+            columns = legislation_columns(records, details)
+            paths[ga_id] = write_partition(columns, os.path.join(directory, f"ga={ga_id}"), fmt)
+        metrics.count("bills_exported", len(records))
+        log.info("[GA %s] Exported %d bills to %s", ga_id, len(records), paths[ga_id])
+    return paths
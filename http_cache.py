@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from metrics import metrics
+
+# Where cached bodies and their index live, next to the rest of the scraper state
+CACHE_DIR = os.getenv('LEGIS_CACHE_DIR', '.scraper-state/http-cache')
+
+# cache:  serve fresh entries, revalidate stale ones, store what is fetched
+# record: always hit the network, storing every response for a later replay
+# replay: serve only from the cache, whatever its age; a miss is an error
+MODES = ("cache", "record", "replay")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_entries_blob ON entries (blob);
+"""
+
+# Response headers worth keeping: enough to decode the body and revalidate it
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+
+class CacheMiss(requests.RequestException):
+    """A replayed request that wasn't recorded"""
+
+
+def request_key(method, url, params=None, data=None):
+    """Cache key for a request: endpoint plus its query and form payload, independent of order"""
+    encoded = json.dumps(
+        [method.upper(), url, sorted((params or {}).items()), sorted((data or {}).items())],
+        separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def build_response(url, status, headers, body):
+    """A requests.Response served from the cache"""
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    response.from_cache = True
+    return response
+
+
+class ResponseCache:
+    """On-disk cache of API responses for LegisClient.
+
+    Bodies are stored content-addressed (by their SHA-256), so identical
+    pages share one file; a small SQLite index maps each request key to its
+    body, status and validators. Entries older than ttl seconds are
+    revalidated with a conditional request, and the least recently used
+    entries are evicted once the bodies pass max_bytes.
+    """
+
+    def __init__(self, path=CACHE_DIR, mode="cache", ttl=3600, max_bytes=200_000_000):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        os.makedirs(os.path.join(path, "blobs"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, "index.db"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Cache configured by LEGIS_CACHE=cache|record|replay, or None when unset"""
+        mode = os.getenv('LEGIS_CACHE', '').strip().lower()
+        if not mode or mode == "off":
+            return None
+        return cls(mode=mode, ttl=float(os.getenv('LEGIS_CACHE_TTL', 3600)))
+
+    def _blob_path(self, digest):
+        return os.path.join(self.path, "blobs", digest[:2], digest)
+
+    def lookup(self, key):
+        """(status, headers, body, stored_at) for a key, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT blob, status, headers, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            blob, status, headers, stored_at = row
+            try:
+                with open(self._blob_path(blob), "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return status, json.loads(headers), body, stored_at
+
+    def store(self, key, response):
+        """Save a successful response under key, then evict down to max_bytes"""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        blob_path = self._blob_path(digest)
+
+        with self.lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                temp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(body)
+                os.replace(temp_path, blob_path)
+            now = time.time()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, blob, size, status, headers, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, digest, len(body), response.status_code, json.dumps(headers), now, now)
+                )
+            self._evict()
+
+    def touch(self, key):
+        """Mark a revalidated entry fresh again"""
+        with self.lock, self.conn:
+            now = time.time()
+            self.conn.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+
+    def total_bytes(self):
+        row = self.conn.execute(
+            "SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM entries GROUP BY blob)"
+        ).fetchone()
+        return row[0] or 0
+
+    def _evict(self):
+        """Drop least recently used entries (and unshared bodies) until under max_bytes"""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        cursor = self.conn.execute("SELECT key, blob, size FROM entries ORDER BY accessed_at")
+        for key, blob, size in cursor.fetchall():
+            if total <= self.max_bytes:
+                break
+            with self.conn:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            shared = self.conn.execute("SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)).fetchone()
+            if not shared:
+                try:
+                    os.remove(self._blob_path(blob))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def fetch(self, send, method, url, params=None, data=None, headers=None):
+        """Serve a request through the cache; send(extra_headers) performs it on the network"""
+        key = request_key(method, url, params, data)
+        caller_conditional = any(name in (headers or {}) for name in CONDITIONAL_HEADERS)
+        cached = None if self.mode == "record" else self.lookup(key)
+
+        if self.mode == "replay":
+            if cached is None:
+                raise CacheMiss(f"No recorded response for {method} {url} {params or ''} {data or ''}")
+            self.hits += 1
+            metrics.count("http_cache_hits")
+            return build_response(url, *cached[:3])
+
+        if cached is not None and time.time() - cached[3] < self.ttl:
+            self.hits += 1
+            metrics.count("http_cache_hits")
+            return build_response(url, *cached[:3])
+
+        # Stale: ask the server whether our copy still holds, unless the caller is revalidating its own
+        extra = {}
+        if cached is not None and not caller_conditional:
+            cached_headers = CaseInsensitiveDict(cached[1])
+            if cached_headers.get("ETag"):
+                extra["If-None-Match"] = cached_headers["ETag"]
+            if cached_headers.get("Last-Modified"):
+                extra["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+        self.misses += 1
+        response = send(extra)
+        if response.status_code == 304 and extra:
+            self.revalidated += 1
+            self.touch(key)
+            return build_response(url, *cached[:3])
+        if response.status_code == 200:
+            self.store(key, response)
+        return response
+
+    def summary(self):
+        return (f"HTTP cache ({self.mode}): {self.hits} hits, {self.misses} misses, "
+                f"{self.revalidated} revalidated, {self.total_bytes():,} bytes")
+
+    def close(self):
+        self.conn.close()
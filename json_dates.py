@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+# The legislature's dates are Delaware dates, whatever timezone the runner is in
+DELAWARE_TZ = ZoneInfo("America/New_York")
+
+MS_PER_DAY = 86_400_000
+
+_PREFIX = "/Date("
+_SUFFIX = ")/"
+
+
+class DateParseError(ValueError):
+    """A JSON date that couldn't be read, with the offending value and why"""
+
+    def __init__(self, value, reason):
+        super().__init__(f"{reason}: {value!r}")
+        self.value = value
+        self.reason = reason
+
+
+def parse_millis(json_date):
+    """Epoch milliseconds from "/Date(1747153160257)/" or "/Date(1747153160257-0500)/".
+
+    Returns None for empty values and raises DateParseError for malformed
+    ones. The milliseconds are UTC either way; a trailing offset only says
+    which zone the server was in, so it is checked and otherwise ignored.
+    """
+    if not json_date:
+        return None
+    if not isinstance(json_date, str):
+        raise DateParseError(json_date, "not a string")
+    if not (json_date.startswith(_PREFIX) and json_date.endswith(_SUFFIX)):
+        raise DateParseError(json_date, "not a /Date(...)/ value")
+
+    body = json_date[len(_PREFIX):-len(_SUFFIX)]
+    if len(body) > 5 and body[-5] in "+-" and body[-4:].isdigit():
+        body = body[:-5]
+    try:
+        return int(body)
+    except ValueError:
+        raise DateParseError(json_date, "bad millisecond count") from None
+
+
+def json_date_millis(json_date):
+    """Epoch milliseconds from a JSON date, or None if it is empty or malformed"""
+    try:
+        return parse_millis(json_date)
+    except DateParseError:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _utc_day(day):
+    """For one UTC day: (ms of the Delaware midnight inside it, Delaware date before, date after).
+
+    Delaware midnight always falls at 04:00 or 05:00 UTC, so every UTC day
+    spans exactly two Delaware dates.
+    """
+    start = datetime.fromtimestamp(day * MS_PER_DAY / 1000, DELAWARE_TZ)
+    next_date = start.date() + timedelta(days=1)
+    midnight = datetime.combine(next_date, time(0), tzinfo=DELAWARE_TZ)
+    return int(midnight.timestamp() * 1000), start.date().isoformat(), next_date.isoformat()
+
+
+def millis_to_date(ms):
+    """Delaware calendar date ("YYYY-MM-DD") of an epoch millisecond timestamp"""
+    midnight_ms, before, after = _utc_day(ms // MS_PER_DAY)
+    return before if ms < midnight_ms else after
+
+
+def format_json_date(json_date):
+    """Delaware calendar date of a JSON date, "" if it is empty; raises DateParseError"""
+    ms = parse_millis(json_date)
+    return "" if ms is None else millis_to_date(ms)
@@ -0,0 +1,177 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import ResponseCache
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+BASE_URL = "https://legis.delaware.gov"
+ALL_LEGISLATION_URL = f"{BASE_URL}/json/AllLegislation/GetAllLegislation"
+
+DEFAULT_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
+    "Referer": "https://legis.delaware.gov/AllLegislation",
+    "Accept": "*/*",
+    "Accept-Encoding": "gzip, deflate"
+}
+
+# Sort expression for newest status changes first (Kendo grid "field-dir" format)
+STATUS_DESC_SORT = "LegislationStatusDateTime-desc"
+
+# Responses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket for pacing requests to legis.delaware.gov"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity  # Max burst size
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def legislation_form(ga_id, page=1, page_size=100, **overrides):
+    """Build the form payload GetAllLegislation expects"""
+    data = {
+        "sort": "",
+        "page": page,
+        "pageSize": page_size,
+        "group": "",
+        "filter": "",
+        "selectedGA[0]": ga_id,
+        "sponsorName": "",
+        "fromIntroDate": "",
+        "toIntroDate": "",
+        "coSponsorCheck": False
+    }
+    data.update(overrides)
+    return data
+
+
+class LegisClient:
+    """Pooled HTTP client for legis.delaware.gov with retries and backoff"""
+
+    def __init__(self, max_retries=4, backoff_base=1.0, backoff_max=60.0,
+                 timeout=(10, 60), pool_size=8, requests_per_second=5, cache=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout  # (connect, read) seconds
+        self.pool_size = pool_size  # Connections kept open; concurrent requests beyond this open throwaway ones
+
+        # One keep-alive session shared by every request (and every worker thread)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.rate_limiter = TokenBucket(requests_per_second, capacity=2)
+        self.retries = 0
+        self.lock = threading.Lock()
+        
+        # Optional ResponseCache; by default configured from LEGIS_CACHE (pass False to disable)
+        self.cache = ResponseCache.from_env() if cache is None else cache or None
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, response):
+        """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), if any"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return min(self.backoff_max, max(0.0, float(value)))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return min(self.backoff_max, max(0.0, retry_at.timestamp() - time.time()))
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the response cache, if there is one"""
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+        
+        def send(extra_headers):
+            # The cache adds validators when revalidating a stale entry
+            headers = {**(kwargs.get("headers") or {}), **extra_headers}
+            return self._send(method, url, **dict(kwargs, headers=headers))
+        
+        return self.cache.fetch(send, method, url, kwargs.get("params"), kwargs.get("data"), kwargs.get("headers"))
+    
+    def _send(self, method, url, **kwargs):
+        """Send a request, retrying connection errors, timeouts and retryable statuses"""
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            metrics.count("http_requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                reason = e.__class__.__name__
+            else:
+                metrics.count("http_bytes_in", len(response.content))
+                if response.status_code == 429:
+                    metrics.count("http_429")
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                reason = f"HTTP {response.status_code}"
+
+            with self.lock:
+                self.retries += 1
+            metrics.count("http_retries")
+            log.warning("%s from %s, retry %d/%d in %.1fs", reason, url, attempt + 1, self.max_retries, delay)
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request("POST", url, data=data, **kwargs)
+
+    def fetch_legislation_page(self, ga_id, page=1, page_size=100, **overrides):
+        """Fetch one page of GetAllLegislation results as parsed JSON"""
+        data = legislation_form(ga_id, page, page_size, **overrides)
+        return self.post(ALL_LEGISLATION_URL, data=data).json()
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
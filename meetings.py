@@ -0,0 +1,179 @@
+import logging
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from legis_client import BASE_URL
+from bill_detail import InfoValueParser
+from columns import INTERNAL_KEYS, col_letter
+from json_dates import DELAWARE_TZ
+from sheets_quota import PRIORITY_COSMETIC, scheduler
+
+log = logging.getLogger(__name__)
+
+MEETING_ITEMS_URL = f"{BASE_URL}/json/MeetingNotice/GetCommitteeMeetingItems"
+
+# Tab the Apps Script meeting export reads its prepared meeting -> bills table from
+MEETINGS_SHEET = "Meetings"
+MEETING_HEADERS = [
+    "Meeting ID", "Committee", "Date/Time", "Meeting URL",
+    "Legislation ID", "Bill", "Sponsor", "Bill URL", "Tracked", "Status", "Refreshed"
+]
+
+MEETING_ID_PATTERN = re.compile(r"MeetingNotice/(\d+)")
+
+# As printed on the meeting notice page, e.g. "6/25/25 1:00 PM"
+NOTICE_DATE_FORMAT = "%m/%d/%y %I:%M %p"
+
+STATUS_INDEX = INTERNAL_KEYS.index("Status")
+TRACKED_COL = MEETING_HEADERS.index("Tracked")
+
+Meeting = namedtuple("Meeting", ["meeting_id", "committee", "starts_at", "url", "items"])
+
+
+def meeting_url(meeting_id):
+    return f"{BASE_URL}/MeetingNotice/{meeting_id}"
+
+
+def parse_meeting_ids(spec):
+    """Meeting ids from a comma-separated mix of ids and Meeting Notice URLs"""
+    meeting_ids = []
+    for part in spec.split(","):
+        part = part.strip()
+        match = MEETING_ID_PATTERN.search(part)
+        if match:
+            meeting_ids.append(int(match.group(1)))
+        elif part.isdigit():
+            meeting_ids.append(int(part))
+        elif part:
+            raise ValueError(f"Not a meeting id or Meeting Notice URL: {part!r}")
+    return meeting_ids
+
+
+def format_meeting_time(starts_at):
+    """"Wednesday, 6/25/25 1:00 PM", the way the meeting export has always shown it"""
+    if starts_at is None:
+        return ""
+    hour = starts_at.hour % 12 or 12
+    return (f"{starts_at:%A}, {starts_at.month}/{starts_at.day}/{starts_at:%y} "
+            f"{hour}:{starts_at:%M} {starts_at:%p}")
+
+
+def parse_meeting_time(text):
+    """Inverse of format_meeting_time, or None"""
+    try:
+        return datetime.strptime(text.split(", ", 1)[-1], NOTICE_DATE_FORMAT).replace(tzinfo=DELAWARE_TZ)
+    except ValueError:
+        return None
+
+
+def fetch_meeting(client, meeting_id):
+    """One meeting's agenda items plus its date/time, scraped from the notice page (the API has none)"""
+    url = meeting_url(meeting_id)
+    items = client.post(
+        MEETING_ITEMS_URL, params={"committeeMeetingId": meeting_id},
+        data={"sort": "", "group": "", "filter": ""}, headers={"Referer": url}
+    ).json().get("Data") or []
+
+    parser = InfoValueParser()
+    parser.feed(client.get(url).text)
+    raw_time = next((value for label, value in parser.pairs.items() if label.startswith("Date/Time")), "")
+    try:
+        starts_at = datetime.strptime(raw_time, NOTICE_DATE_FORMAT).replace(tzinfo=DELAWARE_TZ)
+    except ValueError:
+        starts_at = None
+
+    committee = ""
+    if items:
+        first = items[0]
+        committee = f"{first.get('CommitteeTypeShortCode') or 'House'} {first.get('CommitteeName')}"
+    return Meeting(meeting_id, committee, starts_at, url, items)
+
+
+def fetch_meetings(client, meeting_ids, max_workers=4):
+    """Fetch several meetings concurrently, skipping (and reporting) any that fail"""
+    def fetch(meeting_id):
+        try:
+            return fetch_meeting(client, meeting_id)
+        except (requests.RequestException, ValueError) as e:
+            log.warning("Meeting %s failed: %s", meeting_id, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return [meeting for meeting in pool.map(fetch, meeting_ids) if meeting]
+
+
+def meeting_rows(meetings, existing_bills, refreshed=None):
+    """The meeting -> bills table, joined to tracked bills through the {LegislationId: SheetRow} index.
+
+    Each row carries when it was refreshed, so Code.gs can tell a stale agenda from a current one.
+    """
+    refreshed = (refreshed or datetime.now(DELAWARE_TZ)).isoformat(timespec="seconds")
+    rows = []
+    for meeting in sorted(meetings, key=lambda m: (m.starts_at is None, m.starts_at or 0, m.meeting_id)):
+        for item in meeting.items:
+            leg_id = str(item.get("LegislationId") or "").strip()
+            tracked = existing_bills.get(leg_id)
+            rows.append([
+                meeting.meeting_id,
+                meeting.committee,
+                format_meeting_time(meeting.starts_at),
+                meeting.url,
+                leg_id,
+                item.get("LegislationDisplayText") or item.get("LegislationDisplayCode") or "",
+                item.get("PrimarySponsorShortName") or "",
+                f"{BASE_URL}/BillDetail?LegislationId={leg_id}",
+                "TRUE" if tracked else "FALSE",
+                tracked.values[STATUS_INDEX] if tracked else "",
+                refreshed
+            ])
+    return rows
+
+
+def meetings_worksheet(spreadsheet):
+    import gspread  # Only Sheets commands pay for importing it
+
+    try:
+        return scheduler.read(spreadsheet.worksheet, MEETINGS_SHEET)
+    except gspread.WorksheetNotFound:
+        return scheduler.write(spreadsheet.add_worksheet, title=MEETINGS_SHEET, rows=100,
+                               cols=len(MEETING_HEADERS), priority=PRIORITY_COSMETIC)
+
+
+def upcoming_meeting_ids(worksheet, now=None):
+    """Meetings already in the tab that haven't happened yet, to keep their agendas current"""
+    now = now or datetime.now(DELAWARE_TZ)
+    meeting_ids = set()
+    for row in scheduler.read(worksheet.get_values, "A2:C"):
+        if len(row) < 3 or not str(row[0]).strip().isdigit():
+            continue
+        starts_at = parse_meeting_time(row[2])
+        if starts_at is None or starts_at.date() >= now.date():
+            meeting_ids.add(int(row[0]))
+    return sorted(meeting_ids)
+
+
+def export_meetings(client, spreadsheet, existing_bills, meeting_ids=(), max_workers=4):
+    """Fetch the given and still-upcoming meetings and rewrite the Meetings tab in one update"""
+    worksheet = meetings_worksheet(spreadsheet)
+    meeting_ids = sorted(set(meeting_ids) | set(upcoming_meeting_ids(worksheet)))
+    if not meeting_ids:
+        log.info("No meetings to export")
+        return 0
+
+    log.info("Exporting %d committee meetings", len(meeting_ids))
+    meetings = fetch_meetings(client, meeting_ids, max_workers)
+    rows = meeting_rows(meetings, existing_bills)
+
+    values = [MEETING_HEADERS] + rows
+    if len(values) > worksheet.row_count:
+        scheduler.write(worksheet.add_rows, len(values) - worksheet.row_count, priority=PRIORITY_COSMETIC)
+    scheduler.write(worksheet.batch_clear, [f"A2:{col_letter(len(MEETING_HEADERS))}"], priority=PRIORITY_COSMETIC)
+    scheduler.write(worksheet.update, values=values, range_name="A1", value_input_option="RAW",
+                    priority=PRIORITY_COSMETIC)
+    tracked = sum(1 for row in rows if row[TRACKED_COL] == "TRUE")
+    log.info("Wrote %d meetings, %d agenda items (%d tracked) to '%s'", len(meetings), len(rows), tracked, MEETINGS_SHEET)
+    return len(rows)
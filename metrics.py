@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# Where the JSON run report goes; the Actions workflow archives it as an artifact
+REPORT_PATH = os.getenv('SCRAPER_REPORT_PATH', 'run-report.json')
+
+
+def setup_logging(level=None):
+    """Leveled logging for a run: LOG_LEVEL (default INFO), overridden by level"""
+    level = (level or os.getenv('LOG_LEVEL') or "INFO").upper()
+    logging.basicConfig(level=level, format=LOG_FORMAT, datefmt="%H:%M:%S")
+    # Keep library chatter out of the run log unless debugging
+    if level != "DEBUG":
+        logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+
+class StageTimer:
+    """Accumulated wall time of one pipeline stage"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 3),
+            "mean_s": round(self.total / self.count, 4) if self.count else 0.0,
+            "max_s": round(self.max, 3),
+        }
+
+
+class RunMetrics:
+    """Per-stage timers and counters for one run, safe to update from worker threads.
+
+    Stages (fetch_page, transform, sheet_read, diff, write_batch, ...) are
+    timed with the timer() context manager; counters (pages, bills_new,
+    http_retries, bytes_in, ...) are bumped with count(). report() gathers
+    both into the dict written as the JSON run report.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.stages = {}
+            self.counters = Counter()
+            self.info = {}
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] += n
+
+    def add_time(self, stage, seconds):
+        with self.lock:
+            timer = self.stages.get(stage)
+            if timer is None:
+                timer = self.stages[stage] = StageTimer()
+            timer.add(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def set_info(self, **info):
+        """Run-level facts for the report (mode, GA, outcome, ...)"""
+        with self.lock:
+            self.info.update(info)
+
+    def report(self):
+        with self.lock:
+            finished = time.time()
+            return {
+                "started_at": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                "finished_at": datetime.fromtimestamp(finished).isoformat(timespec="seconds"),
+                "duration_s": round(finished - self.started, 3),
+                **self.info,
+                "stages": {name: timer.as_dict() for name, timer in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def write_report(self, path=REPORT_PATH):
+        report = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        log.info("Run report written to %s", path)
+        return report
+
+
+# Process-wide metrics, shared the way logging's loggers are
+metrics = RunMetrics()
@@ -0,0 +1,81 @@
+from operator import attrgetter
+
+from columns import INTERNAL_KEYS
+from bill_diff import row_fingerprint
+
+# Transformed fields that aren't written to the sheet
+EXTRA_FIELDS = ["BillNumber"]
+
+_sheet_values = attrgetter(*INTERNAL_KEYS)
+
+
+class Bill:
+    """A transformed bill, one slot per field.
+
+    Equality and hashing go through the fingerprint of the compared columns,
+    so two bills are equal exactly when syncing one over the other is a no-op.
+    """
+
+    __slots__ = tuple(INTERNAL_KEYS + EXTRA_FIELDS) + ("fingerprint",)
+
+    def __init__(self, **fields):
+        for name in INTERNAL_KEYS + EXTRA_FIELDS:
+            setattr(self, name, fields.get(name, ""))
+        self.fingerprint = row_fingerprint(self.sheet_values())
+
+    def update(self, **fields):
+        """Set fields after construction (e.g. from the detail page), refreshing the fingerprint"""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.fingerprint = row_fingerprint(self.sheet_values())
+
+    def sheet_values(self):
+        """Synced values as a tuple, in INTERNAL_KEYS order"""
+        return _sheet_values(self)
+
+    def copy(self):
+        return Bill(**{name: getattr(self, name) for name in INTERNAL_KEYS + EXTRA_FIELDS})
+
+    def __eq__(self, other):
+        if not isinstance(other, (Bill, SheetRow)):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __repr__(self):
+        return f"Bill({self.LegislationId!r}, {self.BillNumber!r}, {self.Status!r})"
+
+
+class SheetRow:
+    """A row of the sheet: its row number and synced values in INTERNAL_KEYS order"""
+
+    __slots__ = ("row_num", "values", "_fingerprint")
+
+    def __init__(self, row_num, values, fingerprint=None):
+        self.row_num = row_num
+        self.values = tuple(values)
+        self._fingerprint = fingerprint
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = row_fingerprint(self.values)
+        return self._fingerprint
+
+    @classmethod
+    def from_bill(cls, row_num, bill):
+        """The row a bill was just written to"""
+        return cls(row_num, bill.sheet_values(), bill.fingerprint)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Bill, SheetRow)):
+            return NotImplemented
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __repr__(self):
+        return f"SheetRow({self.row_num}, {self.values[0]!r})"
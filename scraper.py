@@ -1,125 +1,266 @@
-import requests
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
-import time
+import json
+import logging
 import os
 import math
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from legis_client import LegisClient, STATUS_DESC_SORT
+from json_dates import json_date_millis, format_json_date, DateParseError
+from snapshot_store import SnapshotStore, STORE_PATH
+from sheet_writer import SheetWriter, chunked, WRITE_CHUNK_SIZE
+from columns import INTERNAL_KEYS
+from records import Bill
+from bill_codes import LEGISLATION_TYPES, sort_label
+from bill_detail import DetailEnricher
+from meetings import export_meetings
+from targets import FanoutWriter
+from watchlists import export_watchlists
+from metrics import metrics
+from sheets_quota import PRIORITY_APPEND, scheduler
+
+log = logging.getLogger(__name__)
+
+# Where the incremental high-water mark is kept between runs
+STATE_PATH = os.getenv('SCRAPER_STATE_PATH', '.scraper-state/state.json')
+
+# Re-fetch this far behind the watermark so same-day or late-posted status changes aren't missed
+WATERMARK_LOOKBACK_MS = 24 * 60 * 60 * 1000
+
 
 class DelawareLegislationScraper:
-    def __init__(self, service_account_path, spreadsheet_name):
-        """Initialize the scraper with Google Sheets credentials."""
-        # Initialize API settings
-        self.api_url = "https://legis.delaware.gov/json/AllLegislation/GetAllLegislation"
-        self.headers = {
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
-            "Referer": "https://legis.delaware.gov/AllLegislation",
-            "Accept": "*/*"
-        }
-        
-        # Initialize Google Sheets
-        scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        creds = Credentials.from_service_account_file(service_account_path, scopes=scopes)
-        self.gc = gspread.authorize(creds)
-        
-        # Open or create spreadsheet
-        try:
-            self.spreadsheet = self.gc.open(spreadsheet_name)
-            self.sheet = self.spreadsheet.sheet1
-            print(f"Opened existing spreadsheet: {spreadsheet_name}")
-        except gspread.SpreadsheetNotFound:
-            self.spreadsheet = self.gc.create(spreadsheet_name)
+    def __init__(self, service_account_path=None, spreadsheet_name=None, max_workers=4, requests_per_second=5,
+                 state_path=STATE_PATH, store_path=STORE_PATH, enrich=False, http_cache=None):
+        """Set up the API client and local store; Google Sheets is only connected by connect_sheets().
+        
+        spreadsheet_name may be None when writing to configured targets instead.
+        """
+        # Initialize API client (pooled session, retries, shared rate limit)
+        self.client = LegisClient(pool_size=max_workers * 2, requests_per_second=requests_per_second,
+                                  cache=http_cache)
+        self.max_workers = max_workers
+        self.failed_pages = []
+        self.state_path = state_path
+        
+        # Local snapshot of raw API records and the sheet's row index
+        self.store = SnapshotStore(store_path)
+        
+        # BillDetail page fields; pages are only downloaded when enrich is set
+        self.enricher = DetailEnricher(self.client, self.store, max_workers, fetch=enrich)
+        
+        # Google Sheets, connected on first use so fetch-only and local commands skip auth
+        self.service_account_path = service_account_path
+        self.spreadsheet_name = spreadsheet_name
+        self.gc = None
+        self.spreadsheet = None
+        self.sheet = None
+        self.writer = None
+        self.sheets_lock = threading.Lock()
+    
+    def connect_sheets(self):
+        """Authenticate with Google and open (or create) the spreadsheet, once.
+        
+        gspread and google-auth are imported here, not at module load.
+        """
+        with self.sheets_lock:
+            if self.gc is not None:
+                return
+            import gspread
+            from google.oauth2.service_account import Credentials
+            
+            scopes = [
+                'https://www.googleapis.com/auth/spreadsheets',
+                'https://www.googleapis.com/auth/drive'
+            ]
+            creds = Credentials.from_service_account_file(self.service_account_path, scopes=scopes)
+            self.gc = gspread.authorize(creds)
+            
+            if self.spreadsheet_name is None:
+                return
+            
+            # Open or create spreadsheet
+            try:
+                self.spreadsheet = self.gc.open(self.spreadsheet_name)
+                log.info("Opened existing spreadsheet: %s", self.spreadsheet_name)
+            except gspread.SpreadsheetNotFound:
+                self.spreadsheet = self.gc.create(self.spreadsheet_name)
+                log.info("Created new spreadsheet: %s", self.spreadsheet_name)
             self.sheet = self.spreadsheet.sheet1
-            print(f"Created new spreadsheet: {spreadsheet_name}")
+            self.writer = SheetWriter(self.sheet, self.store, detail_columns=self.enricher.fetch)
     
-    def fetch_all_bills(self, ga_id=153, page_size=100):
-        """Fetch all bills from GA 153 across multiple pages"""
-        bills = []
-        page = 1
+    def worksheet_for_ga(self, ga_id):
+        """Open (or create) the "GA <id>" tab used by backfills"""
+        import gspread
+        
+        self.connect_sheets()
+        title = f"GA {ga_id}"
+        try:
+            return scheduler.read(self.spreadsheet.worksheet, title)
+        except gspread.WorksheetNotFound:
+            log.info("Creating worksheet: %s", title)
+            return scheduler.write(self.spreadsheet.add_worksheet, title=title, rows=1000,
+                                   cols=len(INTERNAL_KEYS), priority=PRIORITY_APPEND)
+    
+    def _fetch_page(self, ga_id, page, page_size, **overrides):
+        """Fetch a single page of bills through the shared API client"""
+        with metrics.timer("fetch_page"):
+            result = self.client.fetch_legislation_page(ga_id, page, page_size, **overrides)
+        metrics.count("pages")
+        return result
+    
+    def fetch_all_bills(self, ga_id=153, page_size=100, max_workers=None, stream=False):
+        """Fetch all bills from a GA, fetching pages after the first concurrently.
+        
+        With stream=True, returns a generator that yields bills page by page
+        as pages arrive instead of building the whole list.
+        """
+        self.failed_pages = []
+        bills = self.iter_bills(ga_id, page_size, max_workers, failed_pages=self.failed_pages)
+        return bills if stream else list(bills)
+    
+    def iter_bills(self, ga_id, page_size=100, max_workers=None, failed_pages=None):
+        """Yield every bill in a GA in page order, fetching ahead on a bounded pool.
+        
+        At most two pages per worker are in flight or buffered at once, so
+        memory stays flat however many pages the GA has. Pages that fail are
+        skipped (only that page is lost) and appended to failed_pages.
+        """
+        max_workers = max_workers or self.max_workers
+        failed_pages = failed_pages if failed_pages is not None else []
+        fetched = 0
         
         # Get first page to determine total
-        print(f"Fetching page 1...")
-        data = {
-            "sort": "",
-            "page": page,
-            "pageSize": page_size,
-            "group": "",
-            "filter": "",
-            "selectedGA[0]": ga_id,
-            "sponsorName": "",
-            "fromIntroDate": "",
-            "toIntroDate": "",
-            "coSponsorCheck": False
-        }
-        
-        response = requests.post(self.api_url, headers=self.headers, data=data)
-        response.raise_for_status()
-        result = response.json()
+        log.info("[GA %s] Fetching page 1", ga_id)
+        result = self._fetch_page(ga_id, 1, page_size)
         
         total = result['Total']
-        bills.extend(result['Data'])
-        print(f"Total bills: {total}")
-        print(f"Got {len(result['Data'])} bills from page 1")
-        
-        # Calculate remaining pages
         total_pages = math.ceil(total / page_size)
-        print(f"Total pages to fetch: {total_pages}")
+        log.info("[GA %s] Total bills: %d, pages to fetch: %d", ga_id, total, total_pages)
+        fetched += len(result['Data'])
+        yield from result['Data']
+        
+        # Fetch remaining pages on a bounded pool, yielding them back in page order
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = {}
+            next_page = 2
+            for page in range(2, total_pages + 1):
+                while next_page <= total_pages and len(pending) < max_workers * 2:
+                    pending[next_page] = pool.submit(self._fetch_page, ga_id, next_page, page_size)
+                    next_page += 1
+                
+                try:
+                    data = pending.pop(page).result()['Data']
+                except Exception as e:
+                    log.error("[GA %s] Error fetching page %d/%d: %s", ga_id, page, total_pages, e)
+                    metrics.count("pages_failed")
+                    failed_pages.append(page)
+                    continue
+                
+                log.debug("[GA %s] Got %d bills from page %d/%d", ga_id, len(data), page, total_pages)
+                fetched += len(data)
+                yield from data
         
-        # Fetch remaining pages
-        for page in range(2, total_pages + 1):
-            print(f"Fetching page {page}/{total_pages}...")
-            data["page"] = page
-            
-            response = requests.post(self.api_url, headers=self.headers, data=data)
-            response.raise_for_status()
-            result = response.json()
+        if failed_pages:
+            log.warning("[GA %s] %d pages failed: %s", ga_id, len(failed_pages), failed_pages)
+        log.info("[GA %s] Total bills fetched: %d", ga_id, fetched)
+    
+    def bill_watermark(self, bill):
+        """Latest of a bill's status and introduction timestamps (epoch ms)"""
+        return max(
+            json_date_millis(bill.get("LegislationStatusDateTime")) or 0,
+            json_date_millis(bill.get("IntroductionDateTime")) or 0
+        )
+    
+    def iter_changed_bills(self, since_ms, ga_id=153, page_size=100):
+        """Yield bills whose status changed at or after since_ms.
+        
+        Pages are requested newest-status-first and paging stops at the first
+        page that reaches back past the watermark. If the API turns out to
+        ignore the sort, the GA is streamed in full instead, skipping the bills
+        already yielded so none comes out twice. Edits that don't bump the status date (e.g. a revised synopsis) are
+        only picked up by a full sync.
+        """
+        cutoff = since_ms - WATERMARK_LOOKBACK_MS
+        count = 0
+        page = 1
+        total_pages = 1
+        previous_ms = None
+        yielded = set()  # LegislationIds, so a fallback full fetch doesn't repeat them
+        
+        while page <= total_pages:
+            log.info("Fetching page %d (newest status first)", page)
+            result = self._fetch_page(ga_id, page, page_size, sort=STATUS_DESC_SORT)
+            total_pages = math.ceil(result['Total'] / page_size)
             
-            bills.extend(result['Data'])
-            print(f"Got {len(result['Data'])} bills from page {page}")
+            for bill in result['Data']:
+                status_ms = json_date_millis(bill.get("LegislationStatusDateTime")) or 0
+                if previous_ms is not None and status_ms > previous_ms:
+                    log.warning("Results are not sorted by status date, falling back to full fetch")
+                    for bill in self.iter_bills(ga_id, page_size, failed_pages=self.failed_pages):
+                        if bill["LegislationId"] not in yielded:
+                            yield bill
+                    return
+                previous_ms = status_ms
+                
+                if status_ms < cutoff:
+                    log.info("Changed bills fetched: %d (%d of %d pages)", count, page, total_pages)
+                    return
+                count += 1
+                yielded.add(bill["LegislationId"])
+                yield bill
             
-            time.sleep(0.2)  # Rate limiting
+            page += 1
         
-        print(f"Total bills fetched: {len(bills)}")
-        return bills
+        log.info("Changed bills fetched: %d (%d of %d pages)", count, total_pages, total_pages)
     
-    def parse_json_date(self, json_date):
-        """Convert JSON date format to readable format"""
-        if not json_date or json_date == "":
-            return ""
-        
+    def load_watermark(self, ga_id=153, sheet_key="default"):
+        """Read the last successful run's high-water mark for a GA and the sheets it wrote, if any"""
         try:
-            # Extract timestamp from "/Date(1747153160257)/"
-            timestamp_str = json_date.strip("/Date()")
-            timestamp = int(timestamp_str)
-            
-            # Convert milliseconds to seconds
-            timestamp_seconds = timestamp / 1000
-            
-            # Convert to datetime
-            dt = datetime.fromtimestamp(timestamp_seconds)
-            
-            # Format as YYYY-MM-DD
-            return dt.strftime("%Y-%m-%d")
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        watermarks = state.get("watermarks", {})
+        watermark = watermarks.get(f"{sheet_key}:{ga_id}")
+        if watermark is None and sheet_key == "default":
+            # Saved before watermarks were kept per sheet, when only the tracker had one
+            watermark = watermarks.get(str(ga_id))
+        return watermark
+    
+    def save_watermark(self, watermark_ms, ga_id=153, sheet_key="default"):
+        """Persist the high-water mark after a successful run.
         
-        except Exception as e:
-            print(f"Error parsing date '{json_date}': {e}")
+        Each sheet (or set of targets) keeps its own, so one run's progress
+        never makes another skip the changes it hasn't written.
+        """
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            state = {}
+        
+        state.setdefault("watermarks", {})[f"{sheet_key}:{ga_id}"] = watermark_ms
+        state["updated_at"] = datetime.now().isoformat()
+        
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(state, f, indent=2)
+        log.info("Saved watermark %s for GA %s (%s)", watermark_ms, ga_id, sheet_key)
+    
+    def parse_json_date(self, json_date):
+        """Convert a JSON date to its Delaware calendar date (YYYY-MM-DD), or "" if unreadable"""
+        try:
+            return format_json_date(json_date)
+        except DateParseError as e:
+            metrics.count("date_errors")
+            log.warning("Error parsing date: %s (%r)", e.reason, e.value)
             return ""
     
     def get_legislation_type_name(self, type_id):
         """Convert legislation type ID to human-readable name"""
-        type_mapping = {
-            1: "Bill",
-            2: "Resolution",
-            3: "Concurrent Resolution",
-            4: "Joint Resolution",
-            5: "Amendment",
-            6: "Substitute"
-        }
-        return type_mapping.get(type_id, f"Unknown ({type_id})")
+        return LEGISLATION_TYPES.get(type_id, f"Unknown ({type_id})")
     
     def transform_bill(self, bill):
         """Transform API response into sheet-ready format"""
@@ -137,354 +278,218 @@ class DelawareLegislationScraper:
         else:
             sort_by = bill_number
         
-        # Normalize the Sort By value for proper sorting (e.g., HB 13 -> HB 013)
+        # Normalize the Sort By value for proper sorting (e.g., HB 13 -> HB 0013)
         sort_by_normalized = self.normalize_bill_number(sort_by)
         
         # Create clickable link using Google Sheets HYPERLINK formula
         bill_url = f"https://legis.delaware.gov/BillDetail?LegislationId={legislation_id}"
         bill_link = f'=HYPERLINK("{bill_url}", "{legislation_display_code}")'
         
-        return {
-            "LegislationId": legislation_id,
-            "SortBy": sort_by_normalized,
-            "BillNumber": bill_number,
-            "DisplayCode": bill_link,
-            "Type": self.get_legislation_type_name(bill.get("LegislationTypeId")),
-            "Chamber": bill.get("ChamberName"),
-            "Sponsor": bill.get("Sponsor"),
-            "ShortTitle": bill.get("ShortTitle") or "",
-            "LongTitle": bill.get("LongTitle") or "",
-            "Synopsis": bill.get("Synopsis") or "",
-            "Status": bill.get("StatusName"),
-            "IntroducedDate": self.parse_json_date(bill.get("IntroductionDateTime")),
-            "LastStatusDate": self.parse_json_date(bill.get("LegislationStatusDateTime")),
-            "HasAmendments": "TRUE" if bill.get("HasAmendments") else "FALSE",  # Convert to uppercase to match Sheets
-            "ParentBill": parent_bill,
-            "AmendmentParent": amendment_parent
-        }
+        # Bill computes its fingerprint over the synced columns on construction
+        return Bill(
+            LegislationId=legislation_id,
+            SortBy=sort_by_normalized,
+            BillNumber=bill_number,
+            DisplayCode=bill_link,
+            Type=self.get_legislation_type_name(bill.get("LegislationTypeId")),
+            Chamber=bill.get("ChamberName"),
+            Sponsor=bill.get("Sponsor"),
+            ShortTitle=bill.get("ShortTitle") or "",
+            LongTitle=bill.get("LongTitle") or "",
+            Synopsis=bill.get("Synopsis") or "",
+            Status=bill.get("StatusName"),
+            IntroducedDate=self.parse_json_date(bill.get("IntroductionDateTime")),
+            LastStatusDate=self.parse_json_date(bill.get("LegislationStatusDateTime")),
+            HasAmendments="TRUE" if bill.get("HasAmendments") else "FALSE",  # Convert to uppercase to match Sheets
+            ParentBill=parent_bill,
+            AmendmentParent=amendment_parent
+        )
     
     def normalize_bill_number(self, bill_number):
-        """Normalize bill number for sorting (e.g., HB 13 -> HB 013)"""
-        if not bill_number:
-            return ""
-        
-        import re
-        # Match pattern like "HB 13" or "SA 2" or "HS 1 for HB 100"
-        match = re.match(r'^([A-Z]+)\s+(\d+)', bill_number)
-        
-        if match:
-            prefix = match.group(1)  # e.g., "HB", "SA", "HS"
-            number = match.group(2)  # e.g., "13", "2", "1"
-            remainder = bill_number[match.end():]  # Everything after the number
-            
-            # Pad number to 3 digits
-            padded_number = number.zfill(3)
-            
-            return f"{prefix} {padded_number}{remainder}"
-        
-        # If no match, return original
-        return bill_number
+        """Normalize bill number for sorting (e.g., HB 13 -> HB 0013)"""
+        return sort_label(bill_number)
     
-    def get_existing_bills(self):
-        """Get all existing bills from the sheet as a dictionary"""
-        try:
-            # Get all values
-            all_values = self.sheet.get_all_values()
-            
-            print(f"Sheet has {len(all_values)} rows total")
-            
-            # If empty, return empty dict
-            if len(all_values) == 0:
-                print("Sheet is completely empty")
-                return {}
-            
-            # If only headers, return empty dict
-            if len(all_values) == 1:
-                print("Sheet has only headers")
-                return {}
-            
-            # Get headers and find LegislationId column
-            headers = all_values[0]
-            print(f"Headers: {headers}")
+    def sync_bills(self, bills, writer, sheet_state, ga_id, chunk_size=WRITE_CHUNK_SIZE, dry_run=False):
+        """Stream raw bills through snapshot, transform and write in bounded chunks.
+        
+        With dry_run the snapshot store (and its search index) is left as it
+        was and no detail pages are fetched, so a later real run still sees
+        every change. Returns (bill_count, success, high_water_mark).
+        """
+        count = 0
+        success = True
+        high_water = 0
+        
+        for chunk in chunked(bills, chunk_size):
+            count += len(chunk)
+            if not dry_run:
+                new_ids, changed_ids = self.store.save_records(chunk, ga_id)
+                log.info("Snapshot: %d new, %d changed raw records", len(new_ids), len(changed_ids))
+            high_water = max([high_water] + [self.bill_watermark(bill) for bill in chunk])
             
-            # Look for "Legislation ID" (with space) not "LegislationId"
-            if "Legislation ID" not in headers:
-                print("WARNING: 'Legislation ID' column not found!")
-                print(f"Available columns: {headers}")
-                return {}
-            
-            id_col_index = headers.index("Legislation ID")
-            print(f"'Legislation ID' is in column {id_col_index}")
-            
-            # Debug: show first few values in that column
-            print(f"\nFirst 5 values in 'Legislation ID' column:")
-            for i, row in enumerate(all_values[1:6], start=2):
-                if len(row) > id_col_index:
-                    print(f"  Row {i}: '{row[id_col_index]}'")
-                else:
-                    print(f"  Row {i}: [row too short, only {len(row)} columns]")
-            
-            # Build dictionary: {LegislationId: (row_number, row_data_dict)}
-            existing_bills = {}
-            for row_num, row in enumerate(all_values[1:], start=2):  # Start at 2 (row 1 is headers)
-                if len(row) > id_col_index and row[id_col_index]:
-                    leg_id = str(row[id_col_index]).strip()  # Add .strip() to remove whitespace
-                    
-                    if leg_id:  # Only add if not empty after stripping
-                        # Convert row to dictionary
-                        row_dict = {}
-                        for i, header in enumerate(headers):
-                            row_dict[header] = row[i] if i < len(row) else ""
-                        
-                        existing_bills[leg_id] = (row_num, row_dict)
-            
-            print(f"\nFound {len(existing_bills)} existing bills")
-            return existing_bills
-        
-        except Exception as e:
-            print(f"ERROR in get_existing_bills: {e}")
-            import traceback
-            traceback.print_exc()
-            return {}
+            metrics.count("bills", len(chunk))
+            with metrics.timer("transform"):
+                transformed_bills = [self.transform_bill(bill) for bill in chunk]
+            with metrics.timer("enrich"):
+                undetailed = self.enricher.enrich(chunk, transformed_bills, fetch=False if dry_run else None)
+            success = writer.write_to_sheet(transformed_bills, sheet_state, undetailed=undetailed) and success
+        
+        return count, success, high_water
     
-    def write_to_sheet(self, bills, existing_bills):
-        """Write bill data to Google Sheet efficiently - add new and update changed bills"""
-        print(f"\n=== WRITE_TO_SHEET DEBUG ===")
-        print(f"Received {len(bills)} bills to process")
-        print(f"Existing bills dict has {len(existing_bills)} entries")
-        
-        # Define column headers matching the existing Google Sheet
-        # Map from our internal keys to the sheet's column names
-        header_mapping = {
-            "LegislationId": "Legislation ID",
-            "DisplayCode": "Bill Number",  # This will be the hyperlink
-            "SortBy": "Sort By",
-            "ShortTitle": "Short Title",
-            "LongTitle": "Long Title",
-            "Synopsis": "Synopsis",
-            "Type": "Type",
-            "IntroducedDate": "Introduced",
-            "Sponsor": "Primary Sponsor",
-            "Chamber": "Chamber",
-            "Status": "Status",
-            "LastStatusDate": "As of",
-            "HasAmendments": "Has Amendments",
-            "ParentBill": "Parent Bill",
-            "AmendmentParent": "Amendment Parent"
-        }
-        
-        # Internal keys in the order they should appear
-        internal_keys = [
-            "LegislationId", "DisplayCode", "SortBy", "ShortTitle",
-            "LongTitle", "Synopsis", "Type", "IntroducedDate",
-            "Sponsor", "Chamber", "Status", "LastStatusDate",
-            "HasAmendments", "ParentBill", "AmendmentParent"
-        ]
-        
-        # Sheet column names in the same order
-        headers = [header_mapping[key] for key in internal_keys]
-        
-        # Check if sheet is empty
-        all_values = self.sheet.get_all_values()
-        print(f"Sheet currently has {len(all_values)} rows")
-        
-        if not all_values:
-            # Write headers
-            print("Sheet is empty, writing headers...")
-            self.sheet.append_row(headers)
-            print("✓ Headers written")
-            all_values = [headers]  # Update all_values so we know headers exist
-        
-        # Separate new bills from existing bills
-        new_bills = []
-        bills_to_update = []
-        
-        print(f"\nCategorizing {len(bills)} bills...")
-        for i, bill in enumerate(bills):
-            leg_id = str(bill["LegislationId"]).strip()
-            
-            if i < 3:  # Debug first 3 bills
-                print(f"\nBill {i+1}: LegislationId = '{leg_id}'")
-                print(f"  Is in existing_bills? {leg_id in existing_bills}")
-            
-            if leg_id not in existing_bills:
-                # Brand new bill
-                new_bills.append(bill)
-                if i < 3:
-                    print(f"  -> Categorized as NEW")
-            else:
-                # Bill exists - check if data has changed
-                row_num, existing_data = existing_bills[leg_id]
-                
-                if i < 3:
-                    print(f"  -> Found in existing (row {row_num})")
-                
-                # Compare data (skip DisplayCode/Bill Number since it's a formula that may not match)
-                has_changes = False
-                changes_found = []
-                for internal_key in internal_keys:
-                    sheet_header = header_mapping[internal_key]
-                    
-                    # Skip DisplayCode - it's a HYPERLINK formula that won't match plain text
-                    # Skip BillNumber - it's derived from LegislationDisplayCode
-                    if internal_key in ["DisplayCode", "BillNumber"]:
-                        continue
-                    
-                    new_value = str(bill.get(internal_key, "")).strip()
-                    old_value = str(existing_data.get(sheet_header, "")).strip()
-                    
-                    if new_value != old_value:
-                        has_changes = True
-                        changes_found.append(f"{sheet_header}: '{old_value}' -> '{new_value}'")
-                
-                if has_changes:
-                    bills_to_update.append((row_num, bill))
-                    if i < 3:
-                        print(f"  -> Categorized as UPDATE")
-                        for change in changes_found[:3]:  # Show first 3 changes
-                            print(f"     {change}")
-                else:
-                    if i < 3:
-                        print(f"  -> No changes, skipping")
-        
-        print(f"\n=== CATEGORIZATION COMPLETE ===")
-        print(f"New bills: {len(new_bills)}")
-        print(f"Bills to update: {len(bills_to_update)}")
-        print(f"Existing (unchanged): {len(existing_bills) - len(bills_to_update)}")
-        
-        # Append new bills
-        if new_bills:
-            print(f"\n=== APPENDING {len(new_bills)} NEW BILLS ===")
-            rows = []
-            for bill in new_bills:
-                # Build row using internal keys in correct order
-                row = [bill.get(internal_key, "") for internal_key in internal_keys]
-                rows.append(row)
-            
-            print(f"First new bill data: {rows[0][:3]}...")  # Show first 3 columns
-            
-            # Use batch_update for better performance
-            try:
-                print("Calling sheet.append_rows()...")
-                
-                # Calculate the starting row (after existing data)
-                current_rows = len(all_values)
-                start_row = current_rows + 1
-                rows_needed = start_row + len(rows) - 1
-                # Check if we need more rows
-                current_max_rows = self.sheet.row_count
-                if rows_needed > current_max_rows:
-                    print(f"Sheet only has {current_max_rows} rows, need {rows_needed}. Expanding...")
-                    self.sheet.add_rows(rows_needed - current_max_rows)
-                    print(f"✓ Expanded sheet to {rows_needed} rows")
-                end_col = self._col_letter(len(internal_keys))
-                range_name = f"A{start_row}:{end_col}"
-                
-                print(f"Appending to range: {range_name}")
-                
-                # Use update instead of append_rows to control exact location
-                result = self.sheet.update(values=rows, range_name=range_name, value_input_option='USER_ENTERED')
-                print(f"update() result: {result}")
-                print(f"✓ Added {len(rows)} new bills")
-            except Exception as e:
-                print(f"ERROR appending rows: {e}")
-                import traceback
-                traceback.print_exc()
+    def fetch(self, ga_id=153, full_sync=False):
+        """Fetch bills (incrementally unless full_sync) into the snapshot store only.
+        
+        Nothing touches Google Sheets and the watermark is left alone, so the
+        next sync still writes everything fetched here. Detail pages are
+        fetched too when the enricher is set to. Returns the bill count.
+        """
+        bills, _ = self.bills_to_sync(ga_id, full_sync)
+        count = 0
+        for chunk in chunked(bills, WRITE_CHUNK_SIZE):
+            count += len(chunk)
+            new_ids, changed_ids = self.store.save_records(chunk, ga_id)
+            log.info("Snapshot: %d new, %d changed raw records", len(new_ids), len(changed_ids))
+            metrics.count("bills", len(chunk))
+            if self.enricher.fetch:
+                with metrics.timer("enrich"):
+                    self.enricher.enrich(chunk, [self.transform_bill(bill) for bill in chunk])
+        
+        metrics.set_info(success=not self.failed_pages, failed_pages=list(self.failed_pages))
+        log.info("Fetched %d bills into %s", count, self.store.path)
+        return count
+    
+    def run(self, full_sync=False, reconcile=False, ga_id=153, meeting_ids=None, watchlists=None,
+            dry_run=False):
+        """Main execution method.
+        
+        With dry_run, the write plan is computed against the local row index
+        and logged instead of written: Google Sheets isn't contacted and the
+        watermark doesn't move. The planned changes are left on self.writer.
+        """
+        if dry_run:
+            self.writer = SheetWriter(None, self.store, dry_run=True, detail_columns=self.enricher.fetch)
+            log.info("Dry run: planning writes against the local sheet index")
+            sheet_state = self.writer.load_local_state()
         else:
-            print("\n=== No new bills to add ===")
+            self.connect_sheets()
+            log.info("Starting scraper, spreadsheet %s", self.spreadsheet.url)
+            # Load the sheet state once, up front, so writes can start as soon as the first pages arrive
+            sheet_state = self.writer.load_sheet_state(reconcile)
+        log.info("Found %d existing bills in sheet", len(sheet_state.existing_bills))
+        
+        count, _ = self.sync_ga(self.writer, sheet_state, ga_id, full_sync, dry_run=dry_run)
+        
+        if dry_run:
+            log.info("Dry run completed: %d bills processed, nothing written", count)
+            return
         
-        # Update existing bills (batch them for efficiency)
-        if bills_to_update:
-            print(f"\n=== UPDATING {len(bills_to_update)} BILLS ===")
+        # Prepared meeting -> bills table for the Apps Script meeting export
+        if meeting_ids is not None:
             try:
-                # Batch updates to avoid API quota (max 60 writes per minute)
-                batch_size = 50  # Update 50 rows at a time
-                total_batches = (len(bills_to_update) + batch_size - 1) // batch_size
-                
-                for batch_num in range(total_batches):
-                    start_idx = batch_num * batch_size
-                    end_idx = min((batch_num + 1) * batch_size, len(bills_to_update))
-                    batch = bills_to_update[start_idx:end_idx]
-                    
-                    print(f"\nBatch {batch_num + 1}/{total_batches}: Updating rows {start_idx + 1} to {end_idx}...")
-                    
-                    # Build batch update request
-                    batch_data = []
-                    for row_num, bill in batch:
-                        row = [bill.get(internal_key, "") for internal_key in internal_keys]
-                        end_col = self._col_letter(len(internal_keys))
-                        range_name = f"A{row_num}:{end_col}{row_num}"
-                        batch_data.append({
-                            'range': range_name,
-                            'values': [row]
-                        })
-                    
-                    # Send batch update
-                    self.sheet.batch_update(batch_data, value_input_option='USER_ENTERED')
-                    print(f"  ✓ Updated {len(batch)} rows")
-                    
-                    # Rate limiting: sleep between batches (except last one)
-                    if batch_num < total_batches - 1:
-                        print(f"  Sleeping 2 seconds to avoid rate limit...")
-                        time.sleep(2)
-                
-                print(f"\n✓ Updated {len(bills_to_update)} existing bills")
-            except Exception as e:
-                print(f"ERROR updating rows: {e}")
-                import traceback
-                traceback.print_exc()
+                export_meetings(self.client, self.spreadsheet, sheet_state.existing_bills,
+                                meeting_ids, self.max_workers)
+            except Exception:
+                log.exception("Error exporting meetings")
+        
+        # Bills matching the saved topic queries, across every stored GA
+        if watchlists:
+            try:
+                export_watchlists(self.spreadsheet, self.store, watchlists)
+            except Exception:
+                log.exception("Error exporting watchlists")
+        
+        log.info("Scraper completed: %d bills processed", count)
+        log.info(self.enricher.summary())
+        if self.client.cache is not None:
+            log.info(self.client.cache.summary())
+    
+    def run_targets(self, targets, full_sync=False, reconcile=False, ga_id=153, dry_run=False):
+        """One fetch and transform pass feeding every configured target spreadsheet.
+        
+        With dry_run, each target's writes are planned against its local row
+        index and logged, as in run(); no spreadsheet is opened.
+        """
+        log.info("Starting scraper for %d targets: %s", len(targets), ", ".join(t.name for t in targets))
+        if dry_run:
+            log.info("Dry run: planning writes against the targets' local sheet indexes")
+            fanout = FanoutWriter.local(targets, self.store, enrich=self.enricher.fetch)
         else:
-            print("\n=== No bills needed updates ===")
+            self.connect_sheets()
+            fanout = FanoutWriter.open(self.gc, targets, self.store, enrich=self.enricher.fetch)
+        fanout.load_sheet_state(reconcile)
+        
+        # New targets start from what earlier runs stored, not a fresh crawl
+        seeded = self.seed_targets(fanout, fanout.unseeded_targets(ga_id), ga_id)
+        count, _ = self.sync_ga(fanout, None, ga_id, full_sync, seeded, dry_run=dry_run)
+        
+        if dry_run:
+            for target in targets:
+                writer = fanout.writers[target.name]
+                log.info("[%s] Would write %d new bills and %d changed fields in %d batchUpdate calls",
+                         target.name, len(writer.planned_new), len(writer.planned_changes),
+                         len(writer.planned_calls))
+            log.info("Dry run completed: %d bills processed, nothing written", count)
+            return
+        
+        log.info("Scraper completed: %d bills processed for %d targets", count, len(targets))
+        log.info(self.enricher.summary())
+        if self.client.cache is not None:
+            log.info(self.client.cache.summary())
     
-    def _col_letter(self, col_num):
-        """Convert column number to letter (1=A, 2=B, ..., 27=AA)"""
-        result = ""
-        while col_num > 0:
-            col_num -= 1
-            result = chr(col_num % 26 + ord('A')) + result
-            col_num //= 26
-        return result
+    def seed_targets(self, fanout, targets, ga_id):
+        """Write every stored bill of a GA to targets not yet seeded with it; False if any write failed.
+        
+        The targets are recorded as seeded only when every write succeeded,
+        so a partly seeded target is seeded again by the next run.
+        """
+        if not targets:
+            return True
+        log.info("Seeding %s from the snapshot store", ", ".join(target.name for target in targets))
+        success = True
+        for chunk in chunked(self.store.iter_records(ga_id), WRITE_CHUNK_SIZE):
+            with metrics.timer("transform"):
+                transformed_bills = [self.transform_bill(bill) for bill in chunk]
+            # Cached detail pages only; the nightly pass fetches what changed
+            undetailed = self.enricher.enrich(chunk, transformed_bills, fetch=False)
+            success = fanout.write_to_sheet(transformed_bills, targets=targets, undetailed=undetailed) and success
+        if success:
+            fanout.mark_seeded(targets, ga_id)
+        return success
+    
+    def bills_to_sync(self, ga_id, full_sync=False, sheet_key="default"):
+        """(bills, watermark): only what changed since sheet_key's last run, unless a full sync is requested"""
+        self.failed_pages = []
+        watermark = None if full_sync else self.load_watermark(ga_id, sheet_key)
+        metrics.set_info(ga_id=ga_id, mode="incremental" if watermark is not None else "full")
+        if watermark is not None:
+            log.info("Incremental mode: fetching changes since watermark %s", watermark)
+            return self.iter_changed_bills(watermark, ga_id=ga_id), watermark
+        log.info("Full sync: fetching every bill")
+        return self.iter_bills(ga_id, failed_pages=self.failed_pages), None
     
-    def run(self):
-        """Main execution method"""
-        print(f"Starting scraper at {datetime.now()}")
-        print(f"Spreadsheet URL: {self.spreadsheet.url}")
-        
-        # Fetch all bills
-        print("\n=== Fetching bills from API ===")
-        bills = self.fetch_all_bills()
-        print(f"Fetched {len(bills)} bills")
-        
-        # Transform bills
-        print("\n=== Transforming bill data ===")
-        transformed_bills = [self.transform_bill(bill) for bill in bills]
-        print(f"Transformed {len(transformed_bills)} bills")
-        
-        # Get existing bills
-        print("\n=== Checking for existing bills in sheet ===")
-        existing_bills = self.get_existing_bills()
-        print(f"Found {len(existing_bills)} existing bills in sheet")
-        
-        # Write to sheet
-        print("\n=== Writing to Google Sheet ===")
-        self.write_to_sheet(transformed_bills, existing_bills)
-        
-        print(f"\n=== Scraper completed at {datetime.now()} ===")
-        print(f"Spreadsheet URL: {self.spreadsheet.url}")
-        print(f"Total bills processed: {len(bills)}")
+    def sync_ga(self, writer, sheet_state, ga_id, full_sync=False, success=True, dry_run=False):
+        """Fetch a GA's bills (incrementally unless full_sync) and write them, advancing the watermark.
+        
+        success carries the outcome of earlier writes in the run (e.g. seeding
+        new targets), so a failure there also holds the watermark back.
+        Returns (bill_count, success).
+        """
+        bills, watermark = self.bills_to_sync(ga_id, full_sync, writer.sheet_key)
+        count, written, high_water = self.sync_bills(bills, writer, sheet_state, ga_id, dry_run=dry_run)
+        success = written and success
+        
+        # Advance the watermark only when everything was fetched and written (a dry run writes nothing)
+        if success and not self.failed_pages:
+            new_watermark = max(high_water, watermark or 0)
+            if new_watermark and not dry_run:
+                self.save_watermark(new_watermark, ga_id, writer.sheet_key)
+        else:
+            log.warning("Run was incomplete, keeping previous watermark")
+        metrics.set_info(success=success, failed_pages=list(self.failed_pages))
+        return count, success
 
 
 if __name__ == "__main__":
-    # Get credentials from environment variable or file path
-    service_account = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', 'service-account.json')
-    
-    # If it's a JSON string (from GitHub secrets), write to temp file
-    if service_account.startswith('{'):
-        with open('/tmp/service-account.json', 'w') as f:
-            f.write(service_account)
-        service_account = '/tmp/service-account.json'
-    
-    spreadsheet_name = "DE WFP Bill Tracker GA 153"
-    
-    scraper = DelawareLegislationScraper(service_account, spreadsheet_name)
-    scraper.run()
+    # Kept for existing schedules: the same as "python cli.py sync ..."
+    from cli import main
+    main(["sync"] + sys.argv[1:])
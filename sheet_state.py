@@ -0,0 +1,83 @@
+import logging
+
+from columns import HEADER_MAPPING, INTERNAL_KEYS, col_letter, column_runs
+from records import SheetRow
+from sheets_quota import scheduler as shared_scheduler
+
+log = logging.getLogger(__name__)
+
+class SheetState:
+    """What a run needs to know about the sheet, read once and passed to every step"""
+
+    def __init__(self, headers=None, used_rows=0, existing_bills=None, header_mapping=HEADER_MAPPING):
+        self.headers = headers or []  # Live header row, including user-added columns
+        self.used_rows = used_rows  # Rows holding data, including the header row
+        self.existing_bills = existing_bills or {}  # {LegislationId: SheetRow}
+        self.header_mapping = header_mapping  # {internal key: header} of the columns this sheet syncs
+
+    def synced_headers(self):
+        """Headers of the synced columns, in INTERNAL_KEYS order"""
+        return [self.header_mapping[key] for key in INTERNAL_KEYS if key in self.header_mapping]
+
+    def key_columns(self):
+        """{internal key: 0-based column} for every synced column present in the live header row"""
+        positions = {header: i for i, header in enumerate(self.headers)}
+        return {key: positions[header] for key, header in self.header_mapping.items() if header in positions}
+
+    def missing_keys(self):
+        """Synced keys whose header isn't in the sheet yet"""
+        return [key for key in INTERNAL_KEYS
+                if key in self.header_mapping and self.header_mapping[key] not in self.headers]
+
+    @property
+    def id_col(self):
+        """0-based index of the Legislation ID column, or None"""
+        id_header = self.header_mapping["LegislationId"]
+        return self.headers.index(id_header) if id_header in self.headers else None
+
+
+def read_sheet_state(sheet, scheduler=shared_scheduler, header_mapping=HEADER_MAPPING):
+    """Read the header row, then only the synced columns of every data row.
+
+    User-added columns (e.g. "Briefing Text", "Good/Bad") are never downloaded.
+    header_mapping names the synced columns; keys it leaves out read as "".
+    """
+    headers = scheduler.read(sheet.row_values, 1)
+    if not headers:
+        log.info("Sheet is completely empty")
+        return SheetState(header_mapping=header_mapping)
+
+    id_header = header_mapping["LegislationId"]
+    if id_header not in headers:
+        log.warning("'%s' column not found! Available columns: %s", id_header, headers)
+        return SheetState(headers, used_rows=len(scheduler.read(sheet.col_values, 1)) or 1,
+                          header_mapping=header_mapping)
+
+    # One range per contiguous block of synced columns, fetched in a single call
+    key_index = {header_mapping[key]: i for i, key in enumerate(INTERNAL_KEYS) if key in header_mapping}
+    synced_cols = [i for i, header in enumerate(headers) if header in key_index]
+    runs = column_runs(synced_cols)
+    ranges = [f"{col_letter(start + 1)}2:{col_letter(end + 1)}" for start, end in runs]
+    value_ranges = scheduler.read(sheet.batch_get, ranges)
+
+    # key_index: where each fetched column lands in a row of synced values (INTERNAL_KEYS order)
+    id_index = INTERNAL_KEYS.index("LegislationId")
+
+    data_rows = max((len(values) for values in value_ranges), default=0)
+    existing_bills = {}
+    for offset in range(data_rows):
+        row_values = [""] * len(INTERNAL_KEYS)
+        for (start, end), values in zip(runs, value_ranges):
+            row = values[offset] if offset < len(values) else []
+            for col in range(start, end + 1):
+                i = col - start
+                if i < len(row):
+                    row_values[key_index[headers[col]]] = row[i]
+
+        leg_id = str(row_values[id_index]).strip()
+        if leg_id:
+            existing_bills[leg_id] = SheetRow(offset + 2, row_values)
+
+    log.info("Read %d synced columns over %d rows (%s), found %d existing bills",
+             len(synced_cols), data_rows, ", ".join(ranges), len(existing_bills))
+    return SheetState(headers, data_rows + 1, existing_bills, header_mapping)
@@ -0,0 +1,323 @@
+import logging
+from itertools import islice
+
+from columns import HEADER_MAPPING, INTERNAL_KEYS, DETAIL_KEYS, col_letter, column_runs
+from sheet_state import SheetState, read_sheet_state
+from write_planner import CellRun, plan_writes, payload_size
+from sheets_quota import PRIORITY_APPEND, PRIORITY_UPDATE, scheduler as shared_scheduler
+from bill_diff import added_change, diff_fields
+from bill_detail import keep_sheet_details
+from records import SheetRow
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+# Bills snapshotted, transformed and written per step of the streaming pipeline
+WRITE_CHUNK_SIZE = 500
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from any iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SheetWriter:
+    """Syncs transformed bills into one worksheet, backed by the local row index.
+    
+    With dry_run, writes are planned and logged but never sent: sheet may be
+    None, the store's row index and journal are left alone, and the plan
+    accumulates in planned_new, planned_changes and planned_calls.
+    
+    The BillDetail columns are only added to a sheet that lacks them when
+    detail_columns is set (the enricher fetches pages, or the target's
+    columns name them); otherwise the sheet would grow empty columns.
+    """
+    
+    def __init__(self, sheet, store, sheet_key="default", scheduler=None, header_mapping=None, dry_run=False,
+                 detail_columns=False):
+        self.sheet = sheet
+        self.store = store
+        self.sheet_key = sheet_key  # Scopes this worksheet's row index in the store
+        self.scheduler = scheduler or shared_scheduler  # Paces calls within the shared Sheets quota
+        self.header_mapping = header_mapping or HEADER_MAPPING  # Which columns to sync, and their headers
+        self.dry_run = dry_run
+        self.detail_columns = detail_columns
+        self.last_changes = []
+        self.planned_new = []  # Bills a dry run would append
+        self.planned_changes = []  # FieldChanges a dry run would write
+        self.planned_calls = []  # (priority, ranges, bytes) per batchUpdate a dry run would send
+    
+    @property
+    def _headers_key(self):
+        return f"headers:{self.sheet_key}"
+    
+    def categorize_bills(self, bills, existing_bills, keys=None):
+        """Split transformed bills into new and changed ones.
+        
+        Unchanged bills are rejected with a single fingerprint comparison; the
+        field-level diff is only computed for bills that actually changed.
+        When keys is given, only changes to those keys count (a sheet that
+        syncs a subset of the columns). Returns (new_bills, bills_to_update,
+        changes), where bills_to_update is a list of (row_num, bill) and
+        changes a list of FieldChange.
+        """
+        new_bills = []
+        bills_to_update = []
+        changes = []
+        
+        for bill in bills:
+            leg_id = str(bill.LegislationId).strip()
+            existing = existing_bills.get(leg_id)
+            
+            if existing is None:
+                new_bills.append(bill)
+                continue
+            
+            if bill.fingerprint == existing.fingerprint:
+                continue
+            
+            bill_changes = diff_fields(bill, existing, self.header_mapping)
+            if keys is not None:
+                bill_changes = [change for change in bill_changes if change.key in keys]
+            if bill_changes:
+                bills_to_update.append((existing.row_num, bill))
+                changes.extend(bill_changes)
+        
+        return new_bills, bills_to_update, changes
+    
+    def write_to_sheet(self, bills, sheet_state, undetailed=()):
+        """Write bill data to Google Sheet efficiently - add new and update changed bills.
+        
+        sheet_state is the SheetState loaded at the start of the run; it is
+        updated in place as rows are appended. undetailed are the bills the
+        enricher had no detail page for: they keep what this sheet shows.
+        Returns False if any append or update failed.
+        """
+        success = True
+        existing_bills = sheet_state.existing_bills
+        keep_sheet_details(undetailed, existing_bills)
+        log.debug("Writing %d bills against %d existing, sheet has %d rows",
+                  len(bills), len(existing_bills), sheet_state.used_rows)
+        
+        if not sheet_state.headers:
+            log.info("Sheet is empty, writing headers")
+            headers = sheet_state.synced_headers()
+            if not self.dry_run:
+                self.scheduler.write(self.sheet.append_row, headers, priority=PRIORITY_APPEND)
+                self.store.set_meta(self._headers_key, headers)
+            sheet_state.headers = headers
+            sheet_state.used_rows = 1
+        
+        self._add_missing_headers(sheet_state)
+        
+        # Resolve column positions from the live header row once, so reordered
+        # or user-inserted columns (e.g. "Briefing Text", "Good/Bad") are never written
+        key_cols = sheet_state.key_columns()
+        col_keys = {col: key for key, col in key_cols.items()}
+        synced_runs = column_runs(key_cols.values())
+        # Positions within Bill.sheet_values() for each sheet column
+        value_index = {col: INTERNAL_KEYS.index(key) for col, key in col_keys.items()}
+        
+        # Separate new bills from existing bills
+        with metrics.timer("diff"):
+            new_bills, bills_to_update, changes = self.categorize_bills(bills, existing_bills, key_cols)
+        self.last_changes = changes
+        
+        unchanged = len(bills) - len(new_bills) - len(bills_to_update)
+        metrics.count("bills_new", len(new_bills))
+        metrics.count("bills_updated", len(bills_to_update))
+        metrics.count("bills_unchanged", unchanged)
+        metrics.count("fields_changed", len(changes))
+        log.info("Categorized %d bills: %d new, %d to update, %d unchanged (%d changed fields)",
+                 len(bills), len(new_bills), len(bills_to_update), unchanged, len(changes))
+        if log.isEnabledFor(logging.DEBUG):
+            for change in changes:
+                log.debug("  %s %s: %r -> %r", change.legislation_id, change.header, change.old, change.new)
+        
+        # Plan every write: new rows appended after the data, changed cells in place
+        append_runs = []
+        start_row = sheet_state.used_rows + 1
+        for i, bill in enumerate(new_bills):
+            row = bill.sheet_values()
+            for first, last in synced_runs:
+                values = [row[value_index[col]] for col in range(first, last + 1)]
+                append_runs.append(CellRun(start_row + i, first + 1, values, bill))
+        
+        update_runs = []
+        changes_by_id = {}
+        for change in changes:
+            changes_by_id.setdefault(change.legislation_id, []).append(change)
+        for row_num, bill in bills_to_update:
+            # Only the cells that changed, grouped into runs of adjacent columns
+            cols = [key_cols[change.key] for change in changes_by_id[str(bill.LegislationId).strip()]]
+            row = bill.sheet_values()
+            for first, last in column_runs(cols):
+                values = [row[value_index[col]] for col in range(first, last + 1)]
+                update_runs.append(CellRun(row_num, first + 1, values, bill))
+        
+        if self.dry_run:
+            self.planned_new.extend(new_bills)
+            self.planned_changes.extend(changes)
+        
+        if not append_runs and not update_runs:
+            log.info("Nothing to write")
+            return success
+        
+        # Appends go first and at a higher priority, so new bills land even when the quota runs short
+        chunks = ([(chunk, PRIORITY_APPEND) for chunk in plan_writes(append_runs)]
+                  + [(chunk, PRIORITY_UPDATE) for chunk in plan_writes(update_runs)])
+        range_count = sum(len(chunk) for chunk, _ in chunks)
+        log.info("Writing %d new and %d changed bills: %d cell runs coalesced into %d ranges across %d batchUpdate calls",
+                 len(new_bills), len(bills_to_update), len(append_runs) + len(update_runs), range_count, len(chunks))
+        
+        if self.dry_run:
+            self._log_plan(chunks, sheet_state)
+            return success
+        
+        # Changes to journal as their cells are written, by LegislationId
+        unjournaled = dict(changes_by_id)
+        unjournaled.update((str(bill.LegislationId).strip(), [added_change(bill, self.header_mapping)]) for bill in new_bills)
+        
+        try:
+            # Make room for appended rows
+            rows_needed = start_row + len(new_bills) - 1
+            current_max_rows = self.sheet.row_count
+            if new_bills and rows_needed > current_max_rows:
+                log.info("Sheet only has %d rows, expanding to %d", current_max_rows, rows_needed)
+                self.scheduler.write(self.sheet.add_rows, rows_needed - current_max_rows, priority=PRIORITY_APPEND)
+            
+            for call_num, (chunk, priority) in enumerate(chunks, start=1):
+                batch_data = [{'range': write_range.range, 'values': write_range.values} for write_range in chunk]
+                with metrics.timer("write_batch"):
+                    self.scheduler.write(self.sheet.batch_update, batch_data,
+                                         value_input_option='USER_ENTERED', priority=priority)
+                metrics.count("sheets_batches")
+                metrics.count("sheets_bytes_out", sum(payload_size(write_range) for write_range in chunk))
+                log.debug("Call %d/%d: wrote %d ranges", call_num, len(chunks), len(chunk))
+                
+                if priority == PRIORITY_APPEND:
+                    sheet_state.used_rows = max(sheet_state.used_rows, max(
+                        write_range.row_start + len(write_range.values) - 1 for write_range in chunk
+                    ))
+                written_rows = [
+                    (str(bill.LegislationId).strip(), SheetRow.from_bill(row_num, bill))
+                    for write_range in chunk for row_num, bill in write_range.bills
+                ]
+                self.store.update_sheet_rows(self.sheet_key, written_rows)
+                existing_bills.update(written_rows)
+                
+                # Journal what this call wrote; a bill split across calls is journaled with its first part
+                journal = [change for leg_id, _ in written_rows for change in unjournaled.pop(leg_id, ())]
+                metrics.count("journal_events", self.store.append_changes(self.sheet_key, journal))
+            
+            log.info("Added %d new bills, updated %d existing bills", len(new_bills), len(bills_to_update))
+        except Exception:
+            success = False
+            metrics.count("write_errors")
+            log.exception("Error writing rows")
+        
+        return success
+    
+    def _add_missing_headers(self, sheet_state):
+        """Append headers for synced columns the sheet doesn't have yet, after the last column"""
+        missing = [key for key in sheet_state.missing_keys() if self.detail_columns or key not in DETAIL_KEYS]
+        if not missing:
+            return
+        
+        headers = [sheet_state.header_mapping[key] for key in missing]
+        first_col = len(sheet_state.headers) + 1
+        last_col = first_col + len(headers) - 1
+        log.info("Adding missing columns: %s", headers)
+        if self.dry_run:
+            sheet_state.headers = sheet_state.headers + headers
+            return
+        
+        if last_col > self.sheet.col_count:
+            self.scheduler.write(self.sheet.add_cols, last_col - self.sheet.col_count, priority=PRIORITY_APPEND)
+        self.scheduler.write(
+            self.sheet.update, values=[headers], priority=PRIORITY_APPEND,
+            range_name=f"{col_letter(first_col)}1:{col_letter(last_col)}1"
+        )
+        sheet_state.headers = sheet_state.headers + headers
+        self.store.set_meta(self._headers_key, sheet_state.headers)
+    
+    def _log_plan(self, chunks, sheet_state):
+        """Log the batchUpdate calls a write would make, and keep them in planned_calls"""
+        for call_num, (chunk, priority) in enumerate(chunks, start=1):
+            size = sum(payload_size(write_range) for write_range in chunk)
+            ranges = [write_range.range for write_range in chunk]
+            self.planned_calls.append((priority, ranges, size))
+            log.info("Would send call %d/%d (%s, %d bytes): %s", call_num, len(chunks),
+                     "append" if priority == PRIORITY_APPEND else "update", size,
+                     ", ".join(ranges) if len(ranges) <= 5 else f"{', '.join(ranges[:5])}, ... ({len(ranges)} ranges)")
+            if priority == PRIORITY_APPEND:
+                # Later chunks of the same dry run append after these rows
+                sheet_state.used_rows = max(sheet_state.used_rows, max(
+                    write_range.row_start + len(write_range.values) - 1 for write_range in chunk
+                ))
+                sheet_state.existing_bills.update(
+                    (str(bill.LegislationId).strip(), SheetRow.from_bill(row_num, bill))
+                    for write_range in chunk for row_num, bill in write_range.bills
+                )
+    
+    def load_local_state(self):
+        """Sheet state from the local row index alone, without contacting Google Sheets (for dry runs).
+        
+        Reflects the sheet as of the last sync; an empty index plans a sheet from scratch.
+        """
+        headers = self.store.get_meta(self._headers_key) or []
+        existing_bills = self.store.load_sheet_index(self.sheet_key) if headers else {}
+        used_rows = max((row.row_num for row in existing_bills.values()), default=1 if headers else 0)
+        return SheetState(headers, used_rows=used_rows, existing_bills=existing_bills,
+                          header_mapping=self.header_mapping)
+    
+    def load_sheet_state(self, reconcile=False):
+        """Sheet state for this run, from the local index when it still matches the sheet.
+        
+        Only the header row and Legislation ID column are downloaded to check
+        that columns and rows haven't been added, removed or re-sorted since the
+        index was recorded. The synced columns are read (and the index rebuilt)
+        on a mismatch or when asked to reconcile.
+        """
+        headers = self.store.get_meta(self._headers_key)
+        if not reconcile and headers and self.store.has_sheet_index(self.sheet_key):
+            state = SheetState(headers, existing_bills=self.store.load_sheet_index(self.sheet_key),
+                               header_mapping=self.header_mapping)
+            with metrics.timer("sheet_index_check"):
+                current = self._sheet_index_is_current(state)
+            if current:
+                log.info("Using local sheet index (%d bills)", len(state.existing_bills))
+                return state
+            log.info("Local sheet index is out of date, reconciling with the sheet")
+        
+        with metrics.timer("sheet_read"):
+            state = read_sheet_state(self.sheet, self.scheduler, self.header_mapping)
+        self.store.replace_sheet_index(self.sheet_key, state.existing_bills)
+        self.store.set_meta(self._headers_key, state.headers)
+        return state
+    
+    def _sheet_index_is_current(self, state):
+        """Check the recorded layout and row numbers against the sheet, filling in used_rows.
+        
+        Reads the header row and the Legislation ID column in a single call.
+        """
+        if state.id_col is None:
+            return False
+        id_letter = col_letter(state.id_col + 1)
+        header_rows, id_rows = self.scheduler.read(self.sheet.batch_get, ["1:1", f"{id_letter}:{id_letter}"])
+        if (header_rows[0] if header_rows else []) != state.headers:
+            return False
+        
+        ids = [str(row[0]).strip() if row else "" for row in id_rows]
+        sheet_ids = {leg_id: row_num for row_num, leg_id in enumerate(ids[1:], start=2) if leg_id}
+        if len(sheet_ids) != len(state.existing_bills):
+            return False
+        if any(sheet_ids.get(leg_id) != row.row_num for leg_id, row in state.existing_bills.items()):
+            return False
+        state.used_rows = len(ids)
+        return True
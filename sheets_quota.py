@@ -0,0 +1,184 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from metrics import metrics
+
+log = logging.getLogger(__name__)
+
+# Sheets API errors worth retrying: quota exhaustion and transient backend errors
+RETRY_CODES = {429, 500, 503}
+
+# Google's per-user quotas, counted separately for reads and writes over a rolling minute
+READS_PER_MINUTE = int(os.getenv('SHEETS_READS_PER_MINUTE', 60))
+WRITES_PER_MINUTE = int(os.getenv('SHEETS_WRITES_PER_MINUTE', 60))
+QUOTA_WINDOW = 60.0
+
+# Pace to this share of the quota: other clients (the Apps Script, people editing) count against it too
+QUOTA_HEADROOM = 0.95
+
+# Call priorities, most urgent first: appending new bills, rewriting changed cells,
+# then cosmetic writes (the Meetings tab) that give way whenever the budget runs low
+PRIORITY_APPEND = 0
+PRIORITY_UPDATE = 1
+PRIORITY_COSMETIC = 2
+
+# Share of each window kept back from cosmetic calls for the more urgent ones
+COSMETIC_RESERVE = 0.1
+
+DURATION_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+
+def _error_code(error):
+    code = getattr(error, "code", None)
+    if code is None and getattr(error, "response", None) is not None:
+        code = error.response.status_code
+    return code
+
+
+def retry_hint(error):
+    """(seconds, quota kind) from a 429's error details, either possibly None.
+
+    RESOURCE_EXHAUSTED errors carry a google.rpc.RetryInfo detail with a
+    retryDelay like "23s", and an ErrorInfo whose quota_limit names the quota
+    that ran out (e.g. "WriteRequestsPerMinutePerUser").
+    """
+    delay = kind = None
+    details = (getattr(error, "error", None) or {}).get("details") or []
+    for detail in details:
+        if not isinstance(detail, dict):
+            continue
+        match = DURATION_PATTERN.match(str(detail.get("retryDelay", "")))
+        if match:
+            delay = float(match.group(1))
+        quota_limit = str((detail.get("metadata") or {}).get("quota_limit", "")).lower()
+        if quota_limit.startswith("read"):
+            kind = "read"
+        elif quota_limit.startswith("write"):
+            kind = "write"
+
+    response = getattr(error, "response", None)
+    if delay is None and response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+    return delay, kind
+
+
+class SheetsScheduler:
+    """Paces every Sheets API call to stay just under Google's per-minute quotas.
+
+    Reads and writes each get a rolling one-minute window of call start
+    times; a call only goes out when its window has room, so nothing sleeps
+    while there is budget and large syncs run as fast as the quota allows.
+    A 429 blocks its quota until the retryDelay Google asks for, and when
+    several threads are waiting the most urgent priority goes first.
+    Cosmetic calls also leave a small reserve of each window untouched.
+
+    clock and sleep are injectable so benchmarks can run on simulated time.
+    """
+
+    def __init__(self, reads_per_minute=READS_PER_MINUTE, writes_per_minute=WRITES_PER_MINUTE,
+                 headroom=QUOTA_HEADROOM, window=QUOTA_WINDOW, clock=time.monotonic, sleep=time.sleep):
+        self.limits = {
+            "read": max(1, int(reads_per_minute * headroom)),
+            "write": max(1, int(writes_per_minute * headroom)),
+        }
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.calls = {"read": deque(), "write": deque()}
+        self.blocked_until = {"read": 0.0, "write": 0.0}
+        self.waiting = {"read": Counter(), "write": Counter()}
+
+    def _wait_time(self, kind, priority, now):
+        """Seconds until a call of this kind and priority may start, 0 if it may start now"""
+        calls = self.calls[kind]
+        while calls and now - calls[0] >= self.window:
+            calls.popleft()
+
+        if now < self.blocked_until[kind]:
+            return self.blocked_until[kind] - now
+        # Let more urgent callers through first; they are woken as soon as there is room
+        if any(self.waiting[kind][p] for p in range(priority)):
+            return 0.05
+
+        reserve = int(self.limits[kind] * COSMETIC_RESERVE) if priority >= PRIORITY_COSMETIC else 0
+        over = len(calls) - (self.limits[kind] - reserve) + 1
+        if over <= 0:
+            return 0
+        # Wait for enough of the oldest calls to leave the window
+        return calls[over - 1] + self.window - now
+
+    def acquire(self, kind, priority=PRIORITY_UPDATE):
+        """Block until the quota has room for one call, and count it against the window"""
+        waited = 0.0
+        with self.lock:
+            self.waiting[kind][priority] += 1
+        try:
+            while True:
+                with self.lock:
+                    now = self.clock()
+                    wait = self._wait_time(kind, priority, now)
+                    if wait <= 0:
+                        self.calls[kind].append(now)
+                        break
+                self.sleep(wait)
+                waited += wait
+        finally:
+            with self.lock:
+                self.waiting[kind][priority] -= 1
+        if waited:
+            metrics.add_time(f"sheets_{kind}_wait", waited)
+        return waited
+
+    def block(self, kind, seconds):
+        """Hold every call of a kind back for seconds, e.g. after Google reports the quota spent"""
+        with self.lock:
+            self.blocked_until[kind] = max(self.blocked_until[kind], self.clock() + seconds)
+
+    def call(self, fn, *args, kind="write", priority=PRIORITY_UPDATE, max_retries=8,
+             base_delay=2.0, max_delay=64.0, **kwargs):
+        """Call a gspread method within the quota, retrying 429s and transient 5xx errors"""
+        from gspread.exceptions import APIError  # Imported by the first Sheets call, not at load
+
+        for attempt in range(max_retries + 1):
+            self.acquire(kind, priority)
+            metrics.count("sheets_requests")
+            try:
+                return fn(*args, **kwargs)
+            except APIError as e:
+                code = _error_code(e)
+                if code not in RETRY_CODES or attempt == max_retries:
+                    raise
+                delay = random.uniform(base_delay / 2, min(max_delay, base_delay * 2 ** attempt))
+                metrics.count("sheets_retries")
+                if code == 429:
+                    metrics.count("sheets_429")
+                    hint, quota_kind = retry_hint(e)
+                    if hint is not None:
+                        # A little jitter so parallel writers don't all return at once
+                        delay = hint + random.uniform(0, 1)
+                    # Block the exhausted quota for everyone, not just this caller
+                    self.block(quota_kind or kind, delay)
+                    log.warning("Sheets %s quota exhausted, holding %s calls for %.1fs (%d/%d)",
+                                quota_kind or kind, quota_kind or kind, delay, attempt + 1, max_retries)
+                else:
+                    log.warning("Sheets API returned %s, retrying in %.1fs (%d/%d)",
+                                code, delay, attempt + 1, max_retries)
+                    self.sleep(delay)
+
+    def read(self, fn, *args, **kwargs):
+        return self.call(fn, *args, kind="read", **kwargs)
+
+    def write(self, fn, *args, priority=PRIORITY_UPDATE, **kwargs):
+        return self.call(fn, *args, kind="write", priority=priority, **kwargs)
+
+
+# Process-wide scheduler: every worksheet in a run shares the same per-user quota
+scheduler = SheetsScheduler()
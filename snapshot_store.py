@@ -0,0 +1,363 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from json_dates import json_date_millis
+from columns import HEADER_MAPPING, INTERNAL_KEYS
+from records import SheetRow
+from bill_codes import bill_sort_key
+
+log = logging.getLogger(__name__)
+
+# Default location, alongside the incremental watermark
+STORE_PATH = os.getenv('SCRAPER_STORE_PATH', '.scraper-state/snapshot.db')
+
+# One journaled change; observed_at is epoch milliseconds, old is None for a newly added bill
+ChangeEvent = namedtuple("ChangeEvent", [
+    "seq", "observed_at", "sheet_key", "legislation_id", "legislation_number", "field", "header", "old", "new"
+])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS legislation (
+    legislation_id INTEGER PRIMARY KEY,
+    ga_id INTEGER NOT NULL,
+    legislation_number TEXT,
+    status_ms INTEGER,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_legislation_ga ON legislation (ga_id, legislation_number);
+CREATE INDEX IF NOT EXISTS idx_legislation_status ON legislation (status_ms);
+
+CREATE TABLE IF NOT EXISTS sheet_rows (
+    sheet_key TEXT NOT NULL,
+    legislation_id TEXT NOT NULL,
+    row_num INTEGER NOT NULL,
+    row_json TEXT NOT NULL,
+    PRIMARY KEY (sheet_key, legislation_id)
+);
+CREATE INDEX IF NOT EXISTS idx_sheet_rows_row ON sheet_rows (sheet_key, row_num);
+
+CREATE TABLE IF NOT EXISTS bill_details (
+    legislation_id INTEGER PRIMARY KEY,
+    status_ms INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    details TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+-- Append-only: every change written to a sheet, never updated or deleted
+CREATE TABLE IF NOT EXISTS change_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    observed_at INTEGER NOT NULL,
+    sheet_key TEXT NOT NULL,
+    legislation_id TEXT NOT NULL,
+    field TEXT NOT NULL,
+    header TEXT,
+    old TEXT,
+    new TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_change_journal_observed ON change_journal (observed_at);
+CREATE INDEX IF NOT EXISTS idx_change_journal_bill ON change_journal (legislation_id, observed_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Full-text index over the text staff triage by; rowid is the LegislationId.
+# Porter stemming lets "housing" match "house" and "evictions" match "eviction".
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS bill_search USING fts5(
+    short_title, long_title, synopsis, tokenize = 'porter unicode61'
+);
+"""
+
+SEARCH_FIELDS = ("ShortTitle", "LongTitle", "Synopsis")
+
+
+def content_hash(record):
+    """Stable hash of a raw API record, independent of key order"""
+    encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _row_values(stored):
+    """Synced values from a stored row: a list in INTERNAL_KEYS order, or a header-keyed dict from older indexes"""
+    if isinstance(stored, dict):
+        return [stored.get(HEADER_MAPPING[key], "") for key in INTERNAL_KEYS]
+    # Rows recorded before a synced column was added read back as blank in it
+    return stored + [""] * (len(INTERNAL_KEYS) - len(stored))
+
+
+class SnapshotStore:
+    """Local SQLite store of raw GetAllLegislation records and the sheet's row index.
+
+    Raw records are keyed by LegislationId with a content hash, so new and
+    changed records are found without touching Google Sheets. The sheet_rows
+    table mirrors what was last read from or written to the sheet, so the
+    sheet only has to be fully downloaded to reconcile.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        
+        # Backfill workers share one connection; keep their transactions from interleaving
+        self.lock = threading.RLock()
+        self.has_search = self._create_search_index()
+        if self.has_search and not self.get_meta("search_index_built"):
+            self._rebuild_search_index()
+    
+    def _migrate(self):
+        """Drop the pre-multi-sheet row index (rebuilt from the sheet on the next run),
+        and give older journals a header column (their rows export the default headers)"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(sheet_rows)")]
+        if columns and "sheet_key" not in columns:
+            self.conn.execute("DROP TABLE sheet_rows")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(change_journal)")]
+        if columns and "header" not in columns:
+            self.conn.execute("ALTER TABLE change_journal ADD COLUMN header TEXT")
+
+    def _create_search_index(self):
+        """Create the full-text index; False when this SQLite build lacks FTS5"""
+        try:
+            self.conn.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError as e:
+            log.warning("Full-text search unavailable (%s); watchlists are disabled", e)
+            return False
+        return True
+
+    def _rebuild_search_index(self):
+        """Index every stored record, for stores created before the index existed"""
+        cursor = self.conn.execute("SELECT payload FROM legislation")
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM bill_search")
+            self._index_records(json.loads(payload) for payload, in cursor)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_index_built', 'true')")
+
+    def close(self):
+        self.conn.close()
+
+    # --- Raw API records ---
+
+    def save_records(self, records, ga_id):
+        """Upsert raw records, returning (new_ids, changed_ids)"""
+        hashes = {}
+        for record in records:
+            hashes[record["LegislationId"]] = (record, content_hash(record))
+
+        with self.lock:
+            known = self.record_hashes(ga_id, hashes)
+        new_ids = [leg_id for leg_id in hashes if leg_id not in known]
+        changed_ids = [leg_id for leg_id, (_, digest) in hashes.items()
+                       if leg_id in known and known[leg_id] != digest]
+
+        now = time.time()
+        rows = []
+        for leg_id in new_ids + changed_ids:
+            record, digest = hashes[leg_id]
+            status_ms = json_date_millis(record.get("LegislationStatusDateTime"))
+            rows.append((
+                leg_id, ga_id, record.get("LegislationNumber"), status_ms,
+                digest, json.dumps(record, separators=(",", ":")), now
+            ))
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO legislation "
+                "(legislation_id, ga_id, legislation_number, status_ms, content_hash, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            # Only new and changed records are re-indexed
+            self._index_records(hashes[leg_id][0] for leg_id in new_ids + changed_ids)
+        return new_ids, changed_ids
+
+    def _index_records(self, records):
+        """(Re)index raw records for full-text search, inside the caller's transaction"""
+        if not self.has_search:
+            return
+        entries = [(record["LegislationId"],) + tuple(record.get(field) or "" for field in SEARCH_FIELDS)
+                   for record in records]
+        self.conn.executemany("DELETE FROM bill_search WHERE rowid = ?", ((entry[0],) for entry in entries))
+        self.conn.executemany(
+            "INSERT INTO bill_search (rowid, short_title, long_title, synopsis) VALUES (?, ?, ?, ?)", entries
+        )
+
+    def search(self, query, ga_ids=None):
+        """(ga_id, raw record) for every stored bill matching an FTS5 query, best match first per GA.
+
+        Raises sqlite3.OperationalError for a malformed query.
+        """
+        sql = ("SELECT l.ga_id, l.payload FROM bill_search "
+               "JOIN legislation l ON l.legislation_id = bill_search.rowid WHERE bill_search MATCH ?")
+        params = [query]
+        if ga_ids:
+            sql += f" AND l.ga_id IN ({', '.join('?' * len(ga_ids))})"
+            params.extend(ga_ids)
+        cursor = self.conn.execute(sql + " ORDER BY l.ga_id DESC, bm25(bill_search)", params)
+        return [(ga_id, json.loads(payload)) for ga_id, payload in cursor]
+
+    def record_hashes(self, ga_id, legislation_ids=None):
+        """{LegislationId: content_hash} for stored records in a GA, only legislation_ids when given"""
+        if legislation_ids is None:
+            cursor = self.conn.execute(
+                "SELECT legislation_id, content_hash FROM legislation WHERE ga_id = ?", (ga_id,)
+            )
+            return dict(cursor)
+
+        legislation_ids = list(legislation_ids)
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(legislation_ids), 500):
+            batch = legislation_ids[start:start + 500]
+            cursor = self.conn.execute(
+                "SELECT legislation_id, content_hash FROM legislation "
+                f"WHERE ga_id = ? AND legislation_id IN ({', '.join('?' * len(batch))})", [ga_id] + batch
+            )
+            found.update(cursor)
+        return found
+
+    def get_record(self, legislation_id):
+        row = self.conn.execute(
+            "SELECT payload FROM legislation WHERE legislation_id = ?", (legislation_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def ga_ids(self):
+        """GAs with stored records, oldest first"""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT ga_id FROM legislation ORDER BY ga_id")]
+
+    def iter_records(self, ga_id):
+        """Yield stored raw records for a GA in natural bill-number order (HB 2 before HB 10)"""
+        cursor = self.conn.execute(
+            "SELECT legislation_number, payload FROM legislation WHERE ga_id = ?", (ga_id,)
+        )
+        for _, payload in sorted(cursor, key=lambda row: bill_sort_key(row[0])):
+            yield json.loads(payload)
+
+    # --- Sheet row index ---
+
+    def has_sheet_index(self, sheet_key):
+        row = self.conn.execute(
+            "SELECT 1 FROM sheet_rows WHERE sheet_key = ? LIMIT 1", (sheet_key,)
+        ).fetchone()
+        return row is not None
+
+    def load_sheet_index(self, sheet_key):
+        """Existing bills for one worksheet: {LegislationId: SheetRow}"""
+        cursor = self.conn.execute(
+            "SELECT legislation_id, row_num, row_json FROM sheet_rows WHERE sheet_key = ?", (sheet_key,)
+        )
+        return {leg_id: SheetRow(row_num, _row_values(json.loads(row_json)))
+                for leg_id, row_num, row_json in cursor}
+
+    def replace_sheet_index(self, sheet_key, existing_bills):
+        """Replace a worksheet's index with a fresh read of the sheet"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM sheet_rows WHERE sheet_key = ?", (sheet_key,))
+            self._write_sheet_rows(sheet_key, existing_bills.items())
+
+    def update_sheet_rows(self, sheet_key, rows):
+        """Record rows just written: iterable of (LegislationId, SheetRow)"""
+        with self.lock, self.conn:
+            self._write_sheet_rows(sheet_key, rows)
+
+    def _write_sheet_rows(self, sheet_key, rows):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO sheet_rows (sheet_key, legislation_id, row_num, row_json) "
+            "VALUES (?, ?, ?, ?)",
+            ((sheet_key, str(leg_id), row.row_num, json.dumps(row.values, default=str))
+             for leg_id, row in rows)
+        )
+
+    # --- Cached BillDetail pages ---
+
+    def load_bill_details(self, legislation_ids):
+        """{LegislationId: (status_ms, etag, last_modified, details)} for the ids that have been fetched"""
+        legislation_ids = list(legislation_ids)
+        found = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(legislation_ids), 500):
+            batch = legislation_ids[start:start + 500]
+            cursor = self.conn.execute(
+                "SELECT legislation_id, status_ms, etag, last_modified, details FROM bill_details "
+                f"WHERE legislation_id IN ({', '.join('?' * len(batch))})", batch
+            )
+            for leg_id, status_ms, etag, last_modified, details in cursor:
+                found[leg_id] = (status_ms, etag, last_modified, json.loads(details))
+        return found
+
+    def save_bill_details(self, entries):
+        """Upsert fetched pages: iterable of (LegislationId, status_ms, etag, last_modified, details)"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO bill_details "
+                "(legislation_id, status_ms, etag, last_modified, details, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((leg_id, status_ms, etag, last_modified, json.dumps(details), now)
+                 for leg_id, status_ms, etag, last_modified, details in entries)
+            )
+
+    # --- Change journal ---
+
+    def append_changes(self, sheet_key, changes, observed_at=None):
+        """Journal FieldChanges just written to a worksheet, all stamped with observed_at (epoch ms)"""
+        observed_at = int(time.time() * 1000) if observed_at is None else observed_at
+        with self.lock, self.conn:
+            cursor = self.conn.executemany(
+                "INSERT INTO change_journal (observed_at, sheet_key, legislation_id, field, header, old, new) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((observed_at, sheet_key, change.legislation_id, change.key, change.header, change.old, change.new)
+                 for change in changes)
+            )
+        return cursor.rowcount
+
+    def changes_since(self, since_ms, until_ms=None, sheet_key=None):
+        """Yield ChangeEvents observed at or after since_ms (and before until_ms), oldest first.
+
+        A range scan over the observed_at index; the bill number comes from
+        the stored raw record when there is one.
+        """
+        query = (
+            "SELECT j.seq, j.observed_at, j.sheet_key, j.legislation_id, l.legislation_number, "
+            "j.field, j.header, j.old, j.new FROM change_journal j "
+            "LEFT JOIN legislation l ON l.legislation_id = CAST(j.legislation_id AS INTEGER) "
+            "WHERE j.observed_at >= ?"
+        )
+        params = [since_ms]
+        if until_ms is not None:
+            query += " AND j.observed_at < ?"
+            params.append(until_ms)
+        if sheet_key is not None:
+            query += " AND j.sheet_key = ?"
+            params.append(sheet_key)
+        for row in self.conn.execute(query + " ORDER BY j.observed_at, j.seq", params):
+            yield ChangeEvent(*row)
+
+    # --- Small key/value metadata ---
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from columns import HEADER_MAPPING, INTERNAL_KEYS, DETAIL_KEYS
+from sheet_writer import SheetWriter
+from sheets_quota import PRIORITY_APPEND, scheduler
+
+log = logging.getLogger(__name__)
+
+# Config listing the spreadsheets one scrape feeds; see targets.example.json
+TARGETS_PATH = os.getenv('SCRAPER_TARGETS_PATH', 'targets.json')
+
+# Filter name -> the Bill fields a value may match
+FILTER_FIELDS = {
+    "chamber": ("Chamber",),
+    "type": ("Type",),
+    "sponsor": ("Sponsor", "AdditionalSponsors", "Cosponsors"),
+}
+
+
+def _names(value):
+    """Lower-cased names in a field, which may be a ", "-separated list (e.g. Cosponsors)"""
+    return {name.strip().lower() for name in str(value or "").split(",") if name.strip()}
+
+
+class Target:
+    """One tracker spreadsheet fed by the shared scrape: where it lives, which columns, which bills"""
+
+    def __init__(self, name, spreadsheet, worksheet=None, columns=None, filters=None):
+        self.name = name
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet  # Tab title; None for the first tab
+        self.columns = columns
+        self.header_mapping = self._header_mapping(columns)
+        self.filters = {}
+        for filter_name, values in (filters or {}).items():
+            if filter_name not in FILTER_FIELDS:
+                raise ValueError(f"Target {name!r}: unknown filter {filter_name!r}, expected one of {sorted(FILTER_FIELDS)}")
+            values = [values] if isinstance(values, str) else values
+            self.filters[filter_name] = {str(value).strip().lower() for value in values}
+
+    def _header_mapping(self, columns):
+        """{internal key: header} from a list of keys (default headers) or a {key: header} mapping"""
+        if columns is None:
+            return HEADER_MAPPING
+        if isinstance(columns, list):
+            columns = {key: HEADER_MAPPING.get(key) for key in columns}
+        unknown = [key for key in columns if key not in INTERNAL_KEYS]
+        if unknown:
+            raise ValueError(f"Target {self.name!r}: unknown columns {unknown}, expected keys from {INTERNAL_KEYS}")
+        if "LegislationId" not in columns:
+            raise ValueError(f"Target {self.name!r}: columns must include LegislationId, used to match rows")
+        return {key: columns[key] for key in INTERNAL_KEYS if key in columns}
+
+    @property
+    def wants_details(self):
+        """Whether the target's configured columns name BillDetail fields (not just the defaults)"""
+        return self.columns is not None and any(key in self.header_mapping for key in DETAIL_KEYS)
+
+    @property
+    def sheet_key(self):
+        """Scopes this target's row index and journal entries in the snapshot store"""
+        return f"target-{self.name}"
+
+    def matches(self, bill):
+        """Whether a transformed bill passes every filter (values within a filter are alternatives)"""
+        for filter_name, wanted in self.filters.items():
+            found = set()
+            for field in FILTER_FIELDS[filter_name]:
+                found |= _names(getattr(bill, field))
+            if not found & wanted:
+                return False
+        return True
+
+    def __repr__(self):
+        return f"Target({self.name!r}, {self.spreadsheet!r})"
+
+
+def load_targets(path=TARGETS_PATH):
+    """Targets from a JSON config: {"targets": [{"name", "spreadsheet", "worksheet", "columns", "filters"}]}"""
+    with open(path) as f:
+        config = json.load(f)
+    targets = [Target(**entry) for entry in config.get("targets", [])]
+    if not targets:
+        raise ValueError(f"No targets in {path}")
+    names = [target.name for target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate target names in {path}: {names}")
+    return targets
+
+
+def open_worksheet(gc, target):
+    """Open (or create) a target's spreadsheet and tab"""
+    import gspread  # Only Sheets commands pay for importing it
+
+    try:
+        spreadsheet = scheduler.read(gc.open, target.spreadsheet)
+    except gspread.SpreadsheetNotFound:
+        log.info("[%s] Creating spreadsheet: %s", target.name, target.spreadsheet)
+        spreadsheet = scheduler.write(gc.create, target.spreadsheet, priority=PRIORITY_APPEND)
+    if target.worksheet is None:
+        return spreadsheet.sheet1
+    try:
+        return scheduler.read(spreadsheet.worksheet, target.worksheet)
+    except gspread.WorksheetNotFound:
+        log.info("[%s] Creating worksheet: %s", target.name, target.worksheet)
+        return scheduler.write(spreadsheet.add_worksheet, title=target.worksheet, rows=1000,
+                               cols=len(target.header_mapping), priority=PRIORITY_APPEND)
+
+
+class FanoutWriter:
+    """Writes one stream of transformed bills to several targets at once.
+
+    Stands in for a SheetWriter in DelawareLegislationScraper.sync_bills:
+    each chunk is filtered per target and the targets' writes run
+    concurrently, all paced by the process-wide Sheets scheduler, so they
+    share one quota budget.
+    """
+
+    def __init__(self, targets, writers):
+        self.targets = targets
+        self.writers = writers  # {target name: SheetWriter}
+        self.states = {}  # {target name: SheetState}
+
+    @classmethod
+    def open(cls, gc, targets, store, enrich=False):
+        """Writers for each target's worksheet; enrich adds the BillDetail columns to every target"""
+        writers = {
+            target.name: SheetWriter(open_worksheet(gc, target), store, sheet_key=target.sheet_key,
+                                     header_mapping=target.header_mapping,
+                                     detail_columns=enrich or target.wants_details)
+            for target in targets
+        }
+        return cls(targets, writers)
+
+    @classmethod
+    def local(cls, targets, store, enrich=False):
+        """Dry-run writers planning against each target's local row index; no spreadsheet is opened"""
+        writers = {
+            target.name: SheetWriter(None, store, sheet_key=target.sheet_key,
+                                     header_mapping=target.header_mapping, dry_run=True,
+                                     detail_columns=enrich or target.wants_details)
+            for target in targets
+        }
+        return cls(targets, writers)
+
+    @property
+    def sheet_key(self):
+        """Scopes the run's watermark: the same set of targets picks up where it left off"""
+        return "targets:" + ",".join(sorted(target.name for target in self.targets))
+
+    def load_sheet_state(self, reconcile=False):
+        """Load every target's state into self.states.
+
+        Returns None: each target is diffed against its own state, so there is
+        no combined state for sync_bills to pass around.
+        """
+        for target in self.targets:
+            writer = self.writers[target.name]
+            if writer.dry_run:
+                self.states[target.name] = writer.load_local_state()
+            else:
+                self.states[target.name] = writer.load_sheet_state(reconcile)
+            log.info("[%s] %d existing bills", target.name, len(self.states[target.name].existing_bills))
+        return None
+
+    def _seeded_key(self, target, ga_id):
+        return f"seeded:{target.sheet_key}:{ga_id}"
+
+    def unseeded_targets(self, ga_id):
+        """Targets never seeded with a GA from the snapshot store, however many rows they have"""
+        return [target for target in self.targets
+                if not self.writers[target.name].store.get_meta(self._seeded_key(target, ga_id))]
+
+    def mark_seeded(self, targets, ga_id):
+        """Record targets as seeded with a GA; dry-run writers wrote nothing, so they stay unseeded"""
+        for target in targets:
+            writer = self.writers[target.name]
+            if not writer.dry_run:
+                writer.store.set_meta(self._seeded_key(target, ga_id), datetime.now().isoformat())
+
+    def write_to_sheet(self, bills, sheet_state=None, targets=None, undetailed=()):
+        """Write the bills each target wants, all targets concurrently; False if any target failed.
+
+        Bills without fetched details are copied per target, so each keeps the
+        details its own sheet shows and never another target's.
+        """
+        targets = targets or self.targets
+        undetailed_ids = {str(bill.LegislationId).strip() for bill in undetailed}
+
+        def write(target):
+            selected = []
+            own_undetailed = []
+            for bill in bills:
+                if not target.matches(bill):
+                    continue
+                if str(bill.LegislationId).strip() in undetailed_ids:
+                    bill = bill.copy()
+                    own_undetailed.append(bill)
+                selected.append(bill)
+            log.info("[%s] %d of %d bills match", target.name, len(selected), len(bills))
+            if not selected:
+                return True
+            return self.writers[target.name].write_to_sheet(selected, self.states[target.name],
+                                                            undetailed=own_undetailed)
+
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            return all(list(pool.map(write, targets)))
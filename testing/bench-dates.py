@@ -0,0 +1,79 @@
+"""Micro-benchmark: json_dates.format_json_date vs the old per-call parse_json_date.
+
+Builds a fixture shaped like a GA's worth of bill dates (many bills sharing
+a few hundred status days), times both converters over it, and counts the
+dates the old runner-local conversion gets wrong for Delaware.
+
+    python testing/bench-dates.py [fixture_size]
+"""
+from datetime import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from json_dates import format_json_date, millis_to_date
+
+
+def old_parse_json_date(json_date):
+    """The converter scraper.py used before json_dates (runner-local timezone)"""
+    if not json_date or json_date == "":
+        return ""
+    try:
+        timestamp_str = json_date.strip("/Date()")
+        timestamp = int(timestamp_str)
+        timestamp_seconds = timestamp / 1000
+        dt = datetime.fromtimestamp(timestamp_seconds)
+        return dt.strftime("%Y-%m-%d")
+    except Exception as e:
+        print(f"Error parsing date '{json_date}': {e}")
+        return ""
+
+
+def build_fixture(size, seed=153):
+    """JSON dates over two years of session days, with some empties and evening timestamps"""
+    rng = random.Random(seed)
+    start_ms = 1735707600000  # 2025-01-01 00:00 Delaware
+    session_days = sorted(rng.sample(range(730), 300))
+    fixture = []
+    for _ in range(size):
+        if rng.random() < 0.05:
+            fixture.append("")
+            continue
+        day = rng.choice(session_days)
+        # Mostly business hours, some late-evening actions that cross midnight UTC
+        hour = rng.choice([9, 10, 11, 13, 14, 15, 16, 20, 21, 22, 23])
+        ms = start_ms + day * 86_400_000 + hour * 3_600_000 + rng.randrange(3_600_000)
+        fixture.append(f"/Date({ms})/")
+    return fixture
+
+
+def bench(label, fn, fixture, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for value in fixture:
+            fn(value)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best:8.3f}s  {len(fixture) / best:>12,.0f} dates/s")
+    return best
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fixture = build_fixture(size)
+    print(f"Fixture: {len(fixture):,} dates, runner TZ={os.environ.get('TZ', '(system)')}\n")
+
+    old = bench("old parse_json_date", old_parse_json_date, fixture)
+    new = bench("json_dates.format_json_date", format_json_date, fixture)
+    print(f"\nSpeedup: {old / new:.1f}x")
+
+    # Old output only matches Delaware dates when the runner itself is in Eastern time
+    mismatches = sum(1 for value in fixture if old_parse_json_date(value) != format_json_date(value))
+    print(f"Dates differing from Delaware time under this runner's TZ: {mismatches:,}")
+
+    # Spot-check late-evening timestamps around the 2025 DST transitions
+    for ms in (1741494600000, 1741667400000, 1762050600000, 1762227000000):
+        print(f"  {ms} -> {millis_to_date(ms)}")
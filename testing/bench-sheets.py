@@ -0,0 +1,102 @@
+"""Sheets I/O benchmark: API calls, payload bytes and simulated time per sync scenario.
+
+Runs the real sync pipeline (snapshot, transform, categorize, plan, write)
+against testing/fake_sheets.FakeWorksheet, for each bill count:
+
+  cold     empty sheet, every bill appended
+  no-op    the same bills again the next night: nothing should be written
+  status   every bill's status changes: its Status and As of cells rewritten
+
+Calls are paced by sheets_quota.SheetsScheduler on the fake sheet's
+simulated clock, and the fake rejects anything over quota with a 429, so
+"rejected" should stay 0 and "quota wait s" is the scheduler's pacing.
+
+    python testing/bench-sheets.py [--sizes 1000,10000,50000] [--json results.json]
+
+Compare --json output between commits to catch write-efficiency regressions.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_sheets import FakeWorksheet, SheetStats, raw_bill
+from scraper import DelawareLegislationScraper
+from sheet_writer import SheetWriter
+from metrics import setup_logging
+from sheets_quota import SheetsScheduler
+
+GA_ID = 153
+
+
+def run_scenario(scraper, sheet, scheduler, bills):
+    """One night's sync against the fake sheet, starting from the local index like a real run"""
+    before = sheet.stats.as_dict()
+    writer = SheetWriter(sheet, scraper.store, scheduler=scheduler)
+    started = time.perf_counter()
+    state = writer.load_sheet_state()
+    count, success, _ = scraper.sync_bills(iter(bills), writer, state, GA_ID)
+    elapsed = time.perf_counter() - started
+
+    after = sheet.stats.as_dict()
+    delta = {key: round(after[key] - before[key], 2) for key in after if key != "calls"}
+    delta["calls"] = {method: n - before["calls"].get(method, 0) for method, n in after["calls"].items()
+                      if n - before["calls"].get(method, 0)}
+    delta.update(bills=count, success=success, wall_seconds=round(elapsed, 2))
+    return delta
+
+
+def run_size(size):
+    rng = random.Random(size)
+    # In-memory store, no HTTP cache and no detail fetches: nothing touches the network or disk
+    scraper = DelawareLegislationScraper(store_path=":memory:", http_cache=False)
+    sheet = FakeWorksheet(row_count=1000, stats=SheetStats(raise_on_quota=True))
+    scheduler = SheetsScheduler(clock=lambda: sheet.stats.clock, sleep=sheet.stats.wait)
+
+    introduced = [raw_bill(i, "Introduced", rng=rng) for i in range(size)]
+    results = {"cold": run_scenario(scraper, sheet, scheduler, introduced)}
+    results["no-op"] = run_scenario(scraper, sheet, scheduler, introduced)
+
+    rng = random.Random(size)
+    moved = [raw_bill(i, "Committee", rng=rng) for i in range(size)]
+    results["status"] = run_scenario(scraper, sheet, scheduler, moved)
+    return results
+
+
+# Report columns: (result key, heading)
+COLUMNS = [
+    ("bills", "bills"), ("reads", "reads"), ("writes", "writes"), ("bytes_sent", "bytes up"),
+    ("bytes_received", "bytes down"), ("cells_written", "cells"), ("quota_wait_seconds", "quota wait s"),
+    ("rejected", "rejected"), ("simulated_seconds", "simulated s"), ("wall_seconds", "wall s"),
+]
+
+
+def print_table(all_results):
+    print(f"{'scenario':<14}" + "".join(f"{heading:>14}" for _, heading in COLUMNS))
+    for size, results in all_results.items():
+        for scenario, result in results.items():
+            row = "".join(f"{result[key]:>14,}" for key, _ in COLUMNS)
+            print(f"{scenario + ' ' + str(size):<14}{row}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma-separated bill counts")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper's own output")
+    args = parser.parse_args()
+    setup_logging("INFO" if args.verbose else "WARNING")
+
+    all_results = {}
+    for size in (int(value) for value in args.sizes.split(",")):
+        all_results[size] = run_size(size)
+    print_table(all_results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\nWrote {args.json}")
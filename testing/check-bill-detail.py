@@ -0,0 +1,57 @@
+"""parse_bill_detail against saved BillDetail pages, offline.
+
+Checks the four detail fields parsed from testing/fixtures/bill-detail.html,
+and that a label without a value block doesn't take the next value.
+Any other pages given are parsed and printed, e.g. live captures from
+drafts/test-bill-detail.py --save.
+
+    python testing/check-bill-detail.py [page.html ...]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bill_detail import InfoValueParser, parse_bill_detail
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "bill-detail.html")
+
+EXPECTED = {
+    "AdditionalSponsors": "Sen. Pinkney, Sen. Sturgeon",
+    "Cosponsors": "Rep. Baumbach, Rep. Griffith, Rep. Heffernan & Rep. Morrison",
+    "NextSteps": "Awaiting Consideration, Education Committee",
+    "FiscalNote": "https://legis.delaware.gov/json/BillDetail/GenerateFiscalNotePdf?fiscalNoteId=9911",
+}
+
+# A bill without a fiscal note: its label has no value block, and later values must not fill it
+NO_FISCAL_NOTE = """
+<div class="info-group"><label>Fiscal Note/Fee Impact:</label><span>N/A</span></div>
+<div class="info-group"><div class="info-value">Show All Versions</div></div>
+<div class="info-group"><label>Fiscal Year:</label>
+<label>Next Steps:</label><div class="info-value">Out of Committee</div></div>
+"""
+
+# A fee impact stated as text rather than a linked note
+FEE_TEXT = """<label>Fiscal Note/Fee Impact:</label><div class="info-value">Not Required</div>"""
+
+
+if __name__ == "__main__":
+    with open(FIXTURE, encoding="utf-8") as f:
+        html_text = f.read()
+    details = parse_bill_detail(html_text)
+    assert details == EXPECTED, details
+
+    parser = InfoValueParser()
+    parser.feed(html_text)
+    assert "Companion Bill:" not in parser.pairs, parser.pairs
+
+    details = parse_bill_detail(NO_FISCAL_NOTE)
+    assert details["FiscalNote"] == "" and details["NextSteps"] == "Out of Committee", details
+    assert parse_bill_detail(FEE_TEXT)["FiscalNote"] == "Not Required"
+    print(f"OK: {os.path.relpath(FIXTURE)}")
+
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            details = parse_bill_detail(f.read())
+        print(f"{path}:")
+        for key, value in details.items():
+            print(f"  {key}: {value!r}")
@@ -0,0 +1,55 @@
+"""Incremental fetch when the API ignores the newest-status-first sort.
+
+iter_changed_bills falls back to a full fetch when it sees an out-of-order
+page; bills it already yielded must not come out again, or both copies land
+in one chunk as "new" and the sheet gets a duplicate row.
+
+    python testing/check-changed-bills.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_sheets import FakeWorksheet, raw_bill
+from scraper import DelawareLegislationScraper
+from sheet_writer import SheetWriter
+from metrics import setup_logging
+
+GA_ID = 153
+BILLS = 250
+PAGE_SIZE = 100
+
+
+class UnsortedClient:
+    """Serves the same pages whatever sort is asked for"""
+
+    def __init__(self, records):
+        self.records = records
+
+    def fetch_legislation_page(self, ga_id, page, page_size, **overrides):
+        start = (page - 1) * page_size
+        return {"Total": len(self.records), "Data": self.records[start:start + page_size]}
+
+
+if __name__ == "__main__":
+    setup_logging("WARNING")
+    # Newest first for the first 60 bills, then out of order
+    base_ms = 1747153160257
+    records = [raw_bill(i, status_ms=base_ms - i * 60000) for i in range(60)]
+    records += [raw_bill(i, status_ms=base_ms + i * 60000) for i in range(60, BILLS)]
+
+    scraper = DelawareLegislationScraper(max_workers=2, store_path=":memory:", http_cache=False)
+    scraper.client = UnsortedClient(records)
+
+    ids = [bill["LegislationId"] for bill in scraper.iter_changed_bills(0, GA_ID, PAGE_SIZE)]
+    assert len(ids) == BILLS and len(set(ids)) == BILLS, f"{len(ids)} bills yielded, {len(set(ids))} unique"
+
+    sheet = FakeWorksheet()
+    writer = SheetWriter(sheet, scraper.store)
+    count, success, _ = scraper.sync_bills(scraper.iter_changed_bills(0, GA_ID, PAGE_SIZE), writer,
+                                           writer.load_sheet_state(), GA_ID)
+    sheet_ids = [row[0] for row in sheet.rows[1:] if row]
+    assert success and count == BILLS, (count, success)
+    assert len(sheet_ids) == len(set(sheet_ids)) == BILLS, f"{len(sheet_ids)} rows, {len(set(sheet_ids))} unique"
+    print(f"OK: {BILLS} bills, no duplicates after the unsorted fallback")
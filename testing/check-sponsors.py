@@ -1,28 +1,12 @@
-import requests
 import json
+import os
+import sys
 
-url = "https://legis.delaware.gov/json/AllLegislation/GetAllLegislation"
-headers = {
-    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
-    "Referer": "https://legis.delaware.gov/AllLegislation",
-    "Accept": "*/*"
-}
-data = {
-    "sort": "",
-    "page": 1,
-    "pageSize": 10,
-    "group": "",
-    "filter": "",
-    "selectedGA[0]": 153,
-    "sponsorName": "",
-    "fromIntroDate": "",
-    "toIntroDate": "",
-    "coSponsorCheck": False
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from legis_client import LegisClient
 
-response = requests.post(url, headers=headers, data=data)
-result = response.json()
+client = LegisClient()
+result = client.fetch_legislation_page(153, page=1, page_size=10)
 
 # Get first bill and print all keys
 first_bill = result['Data'][0]
@@ -0,0 +1,67 @@
+"""Fan-out runs keep each target's own BillDetail columns for bills with no cached page.
+
+A target that doesn't sync the detail columns reads them back as "", and a
+bill without a fetched page must not carry those blanks into a later target
+that does sync them.
+
+    python testing/check-target-details.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fake_sheets import FakeWorksheet, raw_bill
+from scraper import DelawareLegislationScraper
+from sheet_writer import SheetWriter
+from columns import HEADER_MAPPING
+from json_dates import json_date_millis
+from metrics import setup_logging
+from targets import FanoutWriter, Target
+
+GA_ID = 153
+DETAILS = {"AdditionalSponsors": "Sen. Pinkney", "Cosponsors": "Rep. Baumbach, Rep. Griffith",
+           "NextSteps": "House Floor", "FiscalNote": "Not Required"}
+
+
+def sync(scraper, targets, sheets, records, reconcile=False):
+    writers = {target.name: SheetWriter(sheets[target.name], scraper.store, target.sheet_key,
+                                        header_mapping=target.header_mapping, detail_columns=True)
+               for target in targets}
+    fanout = FanoutWriter(targets, writers)
+    state = fanout.load_sheet_state(reconcile)
+    _, success, _ = scraper.sync_bills(iter(records), fanout, state, GA_ID)
+    assert success
+
+
+if __name__ == "__main__":
+    setup_logging("WARNING")
+    # The summary target comes first, so it is the one a shared lookup would find
+    targets = [
+        Target("summary", "Summary", columns=["LegislationId", "DisplayCode", "Status"]),
+        Target("full", "Full"),
+    ]
+    sheets = {target.name: FakeWorksheet(title=target.name) for target in targets}
+
+    scraper = DelawareLegislationScraper(store_path=":memory:", http_cache=False)
+
+    # First night: detail pages cached, so the full target gets them
+    introduced = [raw_bill(i) for i in range(5)]
+    scraper.store.save_bill_details(
+        (bill["LegislationId"], json_date_millis(bill["LegislationStatusDateTime"]), None, None, DETAILS)
+        for bill in introduced
+    )
+    sync(scraper, targets, sheets, introduced)
+    full_headers = sheets["full"].rows[0]
+    cosponsors_col = full_headers.index(HEADER_MAPPING["Cosponsors"])
+    assert all(row[cosponsors_col] == DETAILS["Cosponsors"] for row in sheets["full"].rows[1:])
+
+    # Next night: statuses moved, no page fetched for the new status (no --enrich), sheets re-read
+    scraper.store.conn.execute("DELETE FROM bill_details")
+    sync(scraper, targets, sheets, [raw_bill(i, "Committee") for i in range(5)], reconcile=True)
+
+    status_col = full_headers.index(HEADER_MAPPING["Status"])
+    for row in sheets["full"].rows[1:]:
+        assert row[status_col] == "Committee", row
+        assert row[cosponsors_col] == DETAILS["Cosponsors"], f"detail cells blanked: {row}"
+    print("OK: each target kept its own detail columns")
@@ -0,0 +1,289 @@
+"""In-process stand-in for the gspread Worksheet surface the scraper uses.
+
+Keeps the grid in memory, counts every call as a read or write request,
+measures request and response payload bytes, and advances a simulated
+clock by a per-request latency plus any wait the per-minute quota would
+force. Nothing sleeps for real, so large scenarios run in seconds.
+
+With raise_on_quota, a request over the quota is rejected with the 429
+RESOURCE_EXHAUSTED error the real API returns instead of silently waiting,
+which is how the scheduler in sheets_quota.py is exercised; its sleeps go
+to wait(), on the same simulated clock.
+
+raw_bill() makes the GetAllLegislation records the checks and benchmark
+feed through the sync pipeline.
+"""
+import json
+import math
+import random
+import re
+from collections import Counter
+
+import requests
+from gspread.exceptions import APIError
+
+from columns import col_letter
+
+# Google's default per-user quotas: requests per minute, reads and writes counted separately
+READ_QUOTA_PER_MINUTE = 60
+WRITE_QUOTA_PER_MINUTE = 60
+
+# Simulated round trip per request, plus transfer time per payload byte
+REQUEST_LATENCY = 0.25
+SECONDS_PER_BYTE = 1 / 5_000_000
+
+# Bill statuses in order; each later one moves LegislationStatusDateTime a day on
+STATUSES = ["Introduced", "Committee", "Out of Committee", "Passed By House", "Passed By Senate", "Signed"]
+
+A1_CELL = re.compile(r"^([A-Z]*)(\d*)$")
+HYPERLINK_FORMULA = re.compile(r'^=HYPERLINK\("[^"]*",\s*"([^"]*)"\)$', re.IGNORECASE)
+
+
+def raw_bill(i, status="Introduced", status_ms=None, rng=None):
+    """A GetAllLegislation record shaped like the real ones, with realistic text lengths.
+
+    LegislationId is 140000 + i. status_ms overrides the status time, which
+    otherwise follows i and status; rng varies the text (seeded from i by default).
+    """
+    number = i + 1
+    rng = rng or random.Random(i)
+    if status_ms is None:
+        status_ms = 1747153160257 + i * 60000 + STATUSES.index(status) * 86400000
+    return {
+        "LegislationId": 140000 + i,
+        "LegislationNumber": f"HB {number}",
+        "LegislationDisplayCode": f"HB {number}",
+        "LegislationTypeId": 1,
+        "ChamberName": "House",
+        "Sponsor": f"Rep. Member{i % 41}",
+        "ShortTitle": f"AN ACT TO AMEND TITLE {i % 31} RELATING TO ITEM {number}",
+        "LongTitle": "AN ACT TO AMEND THE DELAWARE CODE " + "RELATING TO PUBLIC MATTERS " * rng.randint(2, 6),
+        "Synopsis": "This Act makes changes to existing law. " * rng.randint(4, 12),
+        "StatusName": status,
+        "IntroductionDateTime": f"/Date({1736436429670 + i * 60000})/",
+        "LegislationStatusDateTime": f"/Date({status_ms})/",
+        "HasAmendments": i % 7 == 0,
+    }
+
+
+class GridLimitError(Exception):
+    """A write past the sheet's rows or columns, which the real API rejects with a 400"""
+
+
+def col_index(letters):
+    """1-based column number for letters (A=1, AA=27)"""
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - ord("A") + 1
+    return number
+
+
+class SheetStats:
+    """Calls, payload bytes and simulated time for one fake worksheet"""
+
+    def __init__(self, read_quota=READ_QUOTA_PER_MINUTE, write_quota=WRITE_QUOTA_PER_MINUTE,
+                 raise_on_quota=False):
+        self.calls = Counter()
+        self.reads = 0
+        self.writes = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cells_written = 0
+        self.clock = 0.0  # Simulated seconds since the stats were created
+        self.quota_wait = 0.0
+        self.rejected = 0  # 429s returned in raise_on_quota mode
+        self.raise_on_quota = raise_on_quota
+        self.quotas = {"read": read_quota, "write": write_quota}
+        self._windows = {"read": [], "write": []}  # Start times of requests in the last minute
+
+    def record(self, method, kind, sent=0, received=0):
+        """Count one request, waiting out the per-minute quota first if it is used up"""
+        window = self._windows[kind]
+        window[:] = [started for started in window if self.clock - started < 60]
+        if len(window) >= self.quotas[kind]:
+            wait = 60 - (self.clock - window[0])
+            if self.raise_on_quota:
+                self.rejected += 1
+                self.clock += REQUEST_LATENCY
+                raise quota_error(kind, wait)
+            self.clock += wait
+            self.quota_wait += wait
+            window.pop(0)
+        window.append(self.clock)
+
+        self.calls[method] += 1
+        if kind == "read":
+            self.reads += 1
+        else:
+            self.writes += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.clock += REQUEST_LATENCY + (sent + received) * SECONDS_PER_BYTE
+
+    def wait(self, seconds):
+        """Sleep on the simulated clock, for SheetsScheduler(sleep=...)"""
+        self.clock += seconds
+        self.quota_wait += seconds
+
+    def as_dict(self):
+        return {
+            "reads": self.reads,
+            "writes": self.writes,
+            "calls": dict(self.calls),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "cells_written": self.cells_written,
+            "simulated_seconds": round(self.clock, 2),
+            "quota_wait_seconds": round(self.quota_wait, 2),
+            "rejected": self.rejected,
+        }
+
+
+def quota_error(kind, wait):
+    """The APIError gspread raises for a 429, with Google's RESOURCE_EXHAUSTED details"""
+    quota_limit = "ReadRequestsPerMinutePerUser" if kind == "read" else "WriteRequestsPerMinutePerUser"
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({"error": {
+        "code": 429,
+        "message": f"Quota exceeded for quota metric '{kind.title()} requests' and limit '{quota_limit}'",
+        "status": "RESOURCE_EXHAUSTED",
+        "details": [
+            {"@type": "type.googleapis.com/google.rpc.ErrorInfo", "reason": "RATE_LIMIT_EXCEEDED",
+             "domain": "googleapis.com", "metadata": {"quota_limit": quota_limit}},
+            {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{math.ceil(wait)}s"},
+        ],
+    }}).encode("utf-8")
+    return APIError(response)
+
+
+def _size(payload):
+    return len(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+class FakeWorksheet:
+    """The Worksheet methods the scraper calls, backed by a list of rows of strings.
+
+    Values are stored as entered and read back the way Sheets displays them:
+    a HYPERLINK formula reads as its label and trailing blanks are trimmed.
+    """
+
+    def __init__(self, rows=None, title="Sheet1", row_count=1000, col_count=26, stats=None):
+        self.title = title
+        self.rows = [[str(value) for value in row] for row in rows or []]
+        self.row_count = max(row_count, len(self.rows))
+        self.col_count = col_count
+        self.stats = stats or SheetStats()
+
+    # --- Helpers ---
+
+    def _parse_range(self, a1):
+        """(row_start, col_start, row_end, col_end), 1-based; None ends mean "to the edge of the data" """
+        first, _, last = a1.partition(":")
+        first_col, first_row = A1_CELL.match(first).groups()
+        if not last:
+            last_col, last_row = first_col, first_row
+        else:
+            last_col, last_row = A1_CELL.match(last).groups()
+        return (
+            int(first_row) if first_row else 1,
+            col_index(first_col) if first_col else 1,
+            int(last_row) if last_row else (int(first_row) if first_row and not last else None),
+            col_index(last_col) if last_col else None,
+        )
+
+    def _display(self, value):
+        match = HYPERLINK_FORMULA.match(value)
+        return match.group(1) if match else value
+
+    def _read(self, a1):
+        row_start, col_start, row_end, col_end = self._parse_range(a1)
+        row_end = min(row_end or len(self.rows), len(self.rows))
+        values = []
+        for row in self.rows[row_start - 1:row_end]:
+            last = len(row) if col_end is None else min(col_end, len(row))
+            cells = [self._display(value) for value in row[col_start - 1:last]]
+            while cells and cells[-1] == "":
+                cells.pop()
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _write(self, a1, values):
+        row_start, col_start, _, _ = self._parse_range(a1)
+        for offset, row_values in enumerate(values):
+            row_num = row_start + offset
+            last_col = col_start + len(row_values) - 1
+            if row_num > self.row_count or last_col > self.col_count:
+                raise GridLimitError(f"Range {a1} exceeds grid limits ({self.row_count}x{self.col_count})")
+            while len(self.rows) < row_num:
+                self.rows.append([])
+            row = self.rows[row_num - 1]
+            if len(row) < last_col:
+                row.extend([""] * (last_col - len(row)))
+            for i, value in enumerate(row_values):
+                row[col_start - 1 + i] = "" if value is None else str(value)
+            self.stats.cells_written += len(row_values)
+
+    # --- Reads ---
+
+    def row_values(self, row_num):
+        values = self._read(f"{row_num}:{row_num}") if row_num <= len(self.rows) else []
+        values = values[0] if values else []
+        self.stats.record("row_values", "read", received=_size(values))
+        return values
+
+    def col_values(self, col_num):
+        letter = col_letter(col_num)
+        values = [row[0] if row else "" for row in self._read(f"{letter}1:{letter}")]
+        self.stats.record("col_values", "read", received=_size(values))
+        return values
+
+    def get_all_values(self):
+        values = self._read(f"1:{len(self.rows)}") if self.rows else []
+        self.stats.record("get_all_values", "read", received=_size(values))
+        return values
+
+    def get_values(self, range_name):
+        values = self._read(range_name)
+        self.stats.record("get_values", "read", received=_size(values))
+        return values
+
+    def batch_get(self, ranges):
+        values = [self._read(a1) for a1 in ranges]
+        self.stats.record("batch_get", "read", sent=_size(ranges), received=_size(values))
+        return values
+
+    # --- Writes ---
+
+    def update(self, values=None, range_name="A1", value_input_option=None, **kwargs):
+        self.stats.record("update", "write", sent=_size(values))
+        self._write(range_name, values)
+
+    def batch_update(self, data, value_input_option=None, **kwargs):
+        self.stats.record("batch_update", "write", sent=_size(data))
+        for entry in data:
+            self._write(entry["range"], entry["values"])
+
+    def batch_clear(self, ranges):
+        self.stats.record("batch_clear", "write", sent=_size(ranges))
+        for a1 in ranges:
+            row_start, col_start, row_end, col_end = self._parse_range(a1)
+            for row in self.rows[row_start - 1:row_end or len(self.rows)]:
+                for col in range(col_start - 1, min(col_end or len(row), len(row))):
+                    row[col] = ""
+
+    def append_row(self, values, value_input_option=None, **kwargs):
+        self.stats.record("append_row", "write", sent=_size(values))
+        if len(self.rows) >= self.row_count:
+            self.row_count += 1
+        self._write(f"A{len(self.rows) + 1}", [values])
+
+    def add_rows(self, rows):
+        self.stats.record("add_rows", "write", sent=_size(rows))
+        self.row_count += rows
+
+    def add_cols(self, cols):
+        self.stats.record("add_cols", "write", sent=_size(cols))
+        self.col_count += cols
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from bill_detail import BILL_DETAIL_URL
+from columns import col_letter
+from json_dates import DELAWARE_TZ, format_json_date, DateParseError
+from metrics import metrics
+from sheets_quota import PRIORITY_COSMETIC, scheduler
+
+log = logging.getLogger(__name__)
+
+# Saved topic queries; see watchlists.example.json
+WATCHLISTS_PATH = os.getenv('SCRAPER_WATCHLISTS_PATH', 'watchlists.json')
+
+# Tab the nightly run writes every watchlist's matches to
+WATCHLIST_SHEET = "Watchlist"
+WATCHLIST_HEADERS = [
+    "Watchlist", "GA", "Legislation ID", "Bill", "Short Title", "Primary Sponsor",
+    "Status", "As of", "First Matched", "Bill URL"
+]
+
+# name: shown in the tab; query: FTS5 syntax over Short Title, Long Title and Synopsis
+# ("housing OR rent* OR evict*", "\"minimum wage\""); ga_ids: limit to those GAs, None for all stored
+Watchlist = namedtuple("Watchlist", ["name", "query", "ga_ids"])
+
+
+def load_watchlists(path=WATCHLISTS_PATH):
+    """Watchlists from a JSON config: {"watchlists": [{"name", "query", "ga_ids"}]}"""
+    with open(path) as f:
+        config = json.load(f)
+    return [Watchlist(entry["name"], entry["query"], entry.get("ga_ids")) for entry in config.get("watchlists", [])]
+
+
+def _first_matched_key(watchlist):
+    return f"watchlist:{watchlist.name}"
+
+
+def watchlist_rows(store, watchlists, today=None):
+    """One row per (watchlist, matching bill), newest GA first and best match first within it.
+
+    Remembers when each bill first matched each watchlist in the store's
+    metadata, so the tab shows what is new since the last run.
+    """
+    today = today or datetime.now(DELAWARE_TZ).date().isoformat()
+    rows = []
+    for watchlist in watchlists:
+        started = time.perf_counter()
+        try:
+            matches = store.search(watchlist.query, watchlist.ga_ids)
+        except sqlite3.OperationalError as e:
+            log.error("Watchlist '%s' has a bad query %r: %s", watchlist.name, watchlist.query, e)
+            continue
+        metrics.add_time("watchlist_query", time.perf_counter() - started)
+        metrics.count("watchlist_matches", len(matches))
+
+        first_matched = store.get_meta(_first_matched_key(watchlist), {})
+        new = 0
+        for ga_id, record in matches:
+            leg_id = str(record["LegislationId"])
+            if leg_id not in first_matched:
+                first_matched[leg_id] = today
+                new += 1
+            try:
+                status_date = format_json_date(record.get("LegislationStatusDateTime"))
+            except DateParseError:
+                status_date = ""
+            rows.append([
+                watchlist.name,
+                ga_id,
+                leg_id,
+                record.get("LegislationDisplayCode") or record.get("LegislationNumber") or "",
+                record.get("ShortTitle") or "",
+                record.get("Sponsor") or "",
+                record.get("StatusName") or "",
+                status_date,
+                first_matched[leg_id],
+                f"{BILL_DETAIL_URL}?LegislationId={leg_id}",
+            ])
+        store.set_meta(_first_matched_key(watchlist), first_matched)
+        log.info("Watchlist '%s': %d matches (%d new) in %.1f ms",
+                 watchlist.name, len(matches), new, (time.perf_counter() - started) * 1000)
+    return rows
+
+
+def write_matches(store, query, ga_ids=None, out=sys.stdout):
+    """Print an ad-hoc search as tab-separated GA, bill, status and short title; returns the match count"""
+    matches = store.search(query, ga_ids)
+    for ga_id, record in matches:
+        out.write("\t".join(str(value or "") for value in (
+            ga_id, record.get("LegislationDisplayCode"), record.get("StatusName"), record.get("ShortTitle")
+        )) + "\n")
+    return len(matches)
+
+
+def watchlist_worksheet(spreadsheet):
+    import gspread  # Only Sheets commands pay for importing it
+
+    try:
+        return scheduler.read(spreadsheet.worksheet, WATCHLIST_SHEET)
+    except gspread.WorksheetNotFound:
+        return scheduler.write(spreadsheet.add_worksheet, title=WATCHLIST_SHEET, rows=100,
+                               cols=len(WATCHLIST_HEADERS), priority=PRIORITY_COSMETIC)
+
+
+def export_watchlists(spreadsheet, store, watchlists):
+    """Run every watchlist against the search index and rewrite the Watchlist tab in one update"""
+    if not store.has_search:
+        log.warning("No full-text index in this SQLite build, skipping watchlists")
+        return 0
+    rows = watchlist_rows(store, watchlists)
+    worksheet = watchlist_worksheet(spreadsheet)
+
+    values = [WATCHLIST_HEADERS] + rows
+    if len(values) > worksheet.row_count:
+        scheduler.write(worksheet.add_rows, len(values) - worksheet.row_count, priority=PRIORITY_COSMETIC)
+    scheduler.write(worksheet.batch_clear, [f"A2:{col_letter(len(WATCHLIST_HEADERS))}"], priority=PRIORITY_COSMETIC)
+    scheduler.write(worksheet.update, values=values, range_name="A1", value_input_option="RAW",
+                    priority=PRIORITY_COSMETIC)
+    log.info("Wrote %d watchlist matches to '%s'", len(rows), WATCHLIST_SHEET)
+    return len(rows)
@@ -0,0 +1,97 @@
+import json
+from collections import namedtuple
+
+from columns import col_letter
+
+# Values for one run of adjacent cells in one row. col_start is 1-based;
+# bill is the transformed bill the values came from.
+CellRun = namedtuple("CellRun", ["row_num", "col_start", "values", "bill"])
+
+
+class WriteRange(namedtuple("WriteRange", ["row_start", "col_start", "values", "bills"])):
+    """One rectangular range for values.batchUpdate, with the (row_num, bill) pairs it covers"""
+
+    __slots__ = ()
+
+    @property
+    def range(self):
+        """A1 notation, e.g. "K12" for a single cell or "A5:O9" for a block"""
+        first_col = col_letter(self.col_start)
+        last_col = col_letter(self.col_start + len(self.values[0]) - 1)
+        row_end = self.row_start + len(self.values) - 1
+        if first_col == last_col and self.row_start == row_end:
+            return f"{first_col}{self.row_start}"
+        return f"{first_col}{self.row_start}:{last_col}{row_end}"
+
+    def split(self):
+        """Halve the range by rows"""
+        mid = len(self.values) // 2
+        return [
+            WriteRange(self.row_start, self.col_start, self.values[:mid], self.bills[:mid]),
+            WriteRange(self.row_start + mid, self.col_start, self.values[mid:], self.bills[mid:])
+        ]
+
+
+# Sheets API recommends request bodies stay under 2 MB; leave headroom for JSON overhead
+MAX_PAYLOAD_BYTES = 1_500_000
+
+
+def coalesce(runs):
+    """Merge runs covering the same columns in consecutive rows into rectangular ranges.
+
+    Returns WriteRanges ordered by starting row, then column.
+    """
+    blocks = []
+    for run in sorted(runs, key=lambda r: (r.col_start, len(r.values), r.row_num)):
+        last = blocks[-1] if blocks else None
+        if (last is not None and last["col_start"] == run.col_start
+                and last["width"] == len(run.values) and last["row_end"] + 1 == run.row_num):
+            last["row_end"] = run.row_num
+            last["values"].append(list(run.values))
+            last["bills"].append((run.row_num, run.bill))
+        else:
+            blocks.append({
+                "col_start": run.col_start,
+                "width": len(run.values),
+                "row_start": run.row_num,
+                "row_end": run.row_num,
+                "values": [list(run.values)],
+                "bills": [(run.row_num, run.bill)]
+            })
+
+    blocks.sort(key=lambda b: (b["row_start"], b["col_start"]))
+    return [WriteRange(b["row_start"], b["col_start"], b["values"], b["bills"]) for b in blocks]
+
+
+def payload_size(write_range):
+    """Approximate JSON bytes a range adds to a batchUpdate body"""
+    return len(json.dumps({"range": write_range.range, "values": write_range.values}, default=str))
+
+
+def chunk_ranges(ranges, max_bytes=MAX_PAYLOAD_BYTES):
+    """Pack ranges into as few batchUpdate calls as the payload limit allows"""
+    chunks = []
+    current = []
+    current_size = 0
+    pending = list(reversed(ranges))
+    while pending:
+        write_range = pending.pop()
+        size = payload_size(write_range)
+        if size > max_bytes and len(write_range.values) > 1:
+            # Too big for one request on its own: split by rows and retry the halves
+            pending.extend(reversed(write_range.split()))
+            continue
+        if current and current_size + size > max_bytes:
+            chunks.append(current)
+            current = []
+            current_size = 0
+        current.append(write_range)
+        current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def plan_writes(runs, max_bytes=MAX_PAYLOAD_BYTES):
+    """Coalesce cell runs and split them into batchUpdate-sized chunks"""
+    return chunk_ranges(coalesce(runs), max_bytes)